@@ -11,29 +11,60 @@ Usage:
     python -m agent.agent_runner                    # Run all scenarios (direct mode)
     python -m agent.agent_runner --scenario A1      # Run single scenario
     python -m agent.agent_runner --category B       # Run category
+    python -m agent.agent_runner --workers 4        # Direct mode across 4 processes
     python -m agent.agent_runner --interactive      # Use LLM (requires ANTHROPIC_API_KEY)
+    python -m agent.agent_runner --interactive --concurrency 4   # Bound parallel LLM scenarios
+    python -m agent.agent_runner --batch            # Use LLM via the Message Batches API
 """
 import argparse
-import json
+import asyncio
+import multiprocessing
 import os
 import sys
 import yaml
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
+try:
+    from yaml import CSafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as CSafeLoader
+
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from agent.tools import dispatch_tool, TOOL_DEFINITIONS
+from agent.tools import dispatch_tool, execute_sql_queries, json_dumps, TOOL_DEFINITIONS
 
 
 BASE_DIR = Path(__file__).parent.parent
 SCENARIOS_FILE = BASE_DIR / 'agent' / 'scenarios.yaml'
+HAYSTACK_MAX_CHARS = 256 * 1024  # cap on each tool call searched by validation
+
+# ── LLM request settings (shared by interactive and batch modes) ──
+MODEL = "claude-sonnet-4-20250514"
+
+SYSTEM_PROMPT = (
+    "You are an AI data analyst for Meridian Community Bank. "
+    "You have access to the bank's data catalog (metadata_search), "
+    "the actual database (sql_query), and a business ontology (ontology_query). "
+    "Use these tools to answer questions about the bank's data, quality, lineage, and governance. "
+    "Be specific and cite actual data in your answers."
+)
+
+# Tool definitions in Anthropic format
+_ANTHROPIC_TOOLS = [
+    {
+        "name": td["name"],
+        "description": td["description"],
+        "input_schema": td["parameters"]
+    }
+    for td in TOOL_DEFINITIONS
+]
 
 
 def load_scenarios(scenario_id=None, category=None):
     """Load test scenarios from YAML."""
-    with open(SCENARIOS_FILE) as f:
-        data = yaml.safe_load(f)
+    data = yaml.load(SCENARIOS_FILE.read_bytes(), Loader=CSafeLoader)
 
     scenarios = data['scenarios']
 
@@ -45,8 +76,65 @@ def load_scenarios(scenario_id=None, category=None):
     return scenarios
 
 
-def run_scenario_direct(scenario):
-    """Run a scenario using direct tool calls (no LLM)."""
+# Direct mode's ontology check is the same concept query for every scenario
+DIRECT_ONTOLOGY_SPARQL = """
+    PREFIX meridian: <http://lucivo.ai/ontology/meridian#>
+    PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
+    SELECT ?concept ?label ?comment
+    WHERE {
+        ?concept rdfs:label ?label .
+        OPTIONAL { ?concept rdfs:comment ?comment }
+    }
+    LIMIT 50
+"""
+
+
+def _direct_search_args(scenario):
+    question = scenario['question']
+    search_term = question.split("'")[1] if "'" in question else question[:30]
+    return {
+        'search_term': search_term,
+        'include_lineage': True,
+        'include_quality': True
+    }
+
+
+def prefetch_direct_calls(scenarios):
+    """Run the tool calls of many direct-mode scenarios up front.
+
+    Every sql_hint goes through one pooled connection instead of a checkout
+    per scenario, and the fixed ontology query runs once for the whole set.
+    Returns one {tool_name: result} dict per scenario, in order, for
+    run_scenario_direct.
+    """
+    prefetched = [{} for _ in scenarios]
+    sql_idx = [i for i, s in enumerate(scenarios)
+               if 'sql_hint' in s and 'sql_query' in s.get('expected_tools', [])]
+    sql_results = execute_sql_queries([scenarios[i]['sql_hint'] for i in sql_idx])
+    for i, call_result in zip(sql_idx, sql_results):
+        prefetched[i]['sql_query'] = call_result
+
+    for i, scenario in enumerate(scenarios):
+        if 'metadata_search' in scenario.get('expected_tools', []):
+            prefetched[i]['metadata_search'] = dispatch_tool(
+                'metadata_search', _direct_search_args(scenario))
+
+    onto_idx = [i for i, s in enumerate(scenarios)
+                if 'ontology_query' in s.get('expected_tools', [])]
+    if onto_idx:
+        onto_result = dispatch_tool('ontology_query', {'sparql': DIRECT_ONTOLOGY_SPARQL})
+        for i in onto_idx:
+            prefetched[i]['ontology_query'] = onto_result
+    return prefetched
+
+
+def run_scenario_direct(scenario, prefetched=None):
+    """Run a scenario using direct tool calls (no LLM).
+
+    ``prefetched`` maps tool names to results already fetched by
+    prefetch_direct_calls; other tools are called here.
+    """
+    prefetched = prefetched or {}
     result = {
         'id': scenario['id'],
         'question': scenario['question'],
@@ -59,7 +147,8 @@ def run_scenario_direct(scenario):
     # Execute expected tools
     for tool_name in scenario.get('expected_tools', []):
         if tool_name == 'sql_query' and 'sql_hint' in scenario:
-            call_result = dispatch_tool('sql_query', {'query': scenario['sql_hint']})
+            call_result = prefetched.get('sql_query') or dispatch_tool(
+                'sql_query', {'query': scenario['sql_hint']})
             result['tool_calls'].append({
                 'tool': 'sql_query',
                 'query': scenario['sql_hint'],
@@ -67,32 +156,20 @@ def run_scenario_direct(scenario):
             })
 
         elif tool_name == 'metadata_search':
-            search_term = scenario['question'].split("'")[1] if "'" in scenario['question'] else scenario['question'][:30]
-            call_result = dispatch_tool('metadata_search', {
-                'search_term': search_term,
-                'include_lineage': True,
-                'include_quality': True
-            })
+            search_args = _direct_search_args(scenario)
+            call_result = prefetched.get('metadata_search') or dispatch_tool(
+                'metadata_search', search_args)
             result['tool_calls'].append({
                 'tool': 'metadata_search',
-                'search_term': search_term,
+                'search_term': search_args['search_term'],
                 'datasets_found': len(call_result.get('datasets', [])),
                 'glossary_matches': len(call_result.get('glossary_matches', []))
             })
 
         elif tool_name == 'ontology_query':
             # Basic concept query
-            sparql = """
-                PREFIX meridian: <http://lucivo.ai/ontology/meridian#>
-                PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
-                SELECT ?concept ?label ?comment
-                WHERE {
-                    ?concept rdfs:label ?label .
-                    OPTIONAL { ?concept rdfs:comment ?comment }
-                }
-                LIMIT 50
-            """
-            call_result = dispatch_tool('ontology_query', {'sparql': sparql})
+            call_result = prefetched.get('ontology_query') or dispatch_tool(
+                'ontology_query', {'sparql': DIRECT_ONTOLOGY_SPARQL})
             result['tool_calls'].append({
                 'tool': 'ontology_query',
                 'concepts_found': call_result.get('row_count', 0)
@@ -100,13 +177,13 @@ def run_scenario_direct(scenario):
 
     # Validate expected answer
     if 'expected_answer_contains' in scenario:
+        # Serialize each tool call once; a term only needs to appear somewhere
+        haystacks = [json_dumps(tc)[:HAYSTACK_MAX_CHARS].lower()
+                     for tc in result['tool_calls']]
         for expected in scenario['expected_answer_contains']:
             # Check if expected term appears in any tool result
-            found = False
-            for tc in result['tool_calls']:
-                if expected.lower() in json.dumps(tc).lower():
-                    found = True
-                    break
+            needle = expected.lower()
+            found = any(needle in h for h in haystacks)
             result['validation']['details'].append({
                 'check': f"Contains '{expected}'",
                 'passed': found
@@ -130,82 +207,152 @@ def run_scenario_direct(scenario):
     return result
 
 
-def run_scenario_interactive(scenario, api_key):
-    """Run a scenario using an LLM with tool use."""
-    try:
-        import anthropic
-    except ImportError:
-        return {'id': scenario['id'], 'error': 'anthropic package not installed. pip install anthropic'}
+async def run_scenario_interactive_async(scenario, client, sem):
+    """Run a scenario using an LLM with tool use, without blocking the event loop.
 
-    client = anthropic.Anthropic(api_key=api_key)
+    `client` is an `anthropic.AsyncAnthropic`; `sem` bounds how many scenarios
+    talk to the API at once. Tools are synchronous (SQLAlchemy/rdflib), so they
+    run in worker threads.
+    """
+    async with sem:
+        print(f"\n  Running {scenario['id']}: {scenario['question'][:50]}...")
 
-    # Convert tool definitions to Anthropic format
-    tools = []
-    for td in TOOL_DEFINITIONS:
-        tools.append({
-            "name": td["name"],
-            "description": td["description"],
-            "input_schema": td["parameters"]
-        })
+        messages = [{"role": "user", "content": scenario['question']}]
 
-    messages = [{"role": "user", "content": scenario['question']}]
+        result = {
+            'id': scenario['id'],
+            'question': scenario['question'],
+            'tool_calls': [],
+            'final_answer': '',
+            'validation': {'passed': False, 'details': []}
+        }
 
-    system_prompt = (
-        "You are an AI data analyst for Meridian Community Bank. "
-        "You have access to the bank's data catalog (metadata_search), "
-        "the actual database (sql_query), and a business ontology (ontology_query). "
-        "Use these tools to answer questions about the bank's data, quality, lineage, and governance. "
-        "Be specific and cite actual data in your answers."
-    )
+        # Multi-turn tool use loop (max 5 iterations)
+        for _ in range(5):
+            response = await client.messages.create(
+                model=MODEL,
+                max_tokens=2048,
+                system=SYSTEM_PROMPT,
+                tools=_ANTHROPIC_TOOLS,
+                messages=messages
+            )
 
-    result = {
-        'id': scenario['id'],
-        'question': scenario['question'],
-        'tool_calls': [],
-        'final_answer': '',
-        'validation': {'passed': False, 'details': []}
-    }
+            assistant_content = response.content
+            messages.append({"role": "assistant", "content": assistant_content})
 
-    # Multi-turn tool use loop (max 5 iterations)
-    for _ in range(5):
-        response = client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=2048,
-            system=system_prompt,
-            tools=tools,
-            messages=messages
-        )
+            tool_uses = [block for block in assistant_content if block.type == "tool_use"]
 
-        # Collect text and tool use blocks
-        assistant_content = response.content
-        messages.append({"role": "assistant", "content": assistant_content})
+            if not tool_uses:
+                text_blocks = [block.text for block in assistant_content if hasattr(block, 'text')]
+                result['final_answer'] = '\n'.join(text_blocks)
+                break
 
-        tool_uses = [block for block in assistant_content if block.type == "tool_use"]
+            tool_results = await _run_tool_uses(tool_uses, result)
+            messages.append({"role": "user", "content": tool_results})
 
-        if not tool_uses:
-            # Final text response
-            text_blocks = [block.text for block in assistant_content if hasattr(block, 'text')]
-            result['final_answer'] = '\n'.join(text_blocks)
-            break
+    _validate_answer(scenario, result)
+    return result
 
-        # Execute tool calls
-        tool_results = []
-        for tool_use in tool_uses:
-            tool_result = dispatch_tool(tool_use.name, tool_use.input)
-            result['tool_calls'].append({
-                'tool': tool_use.name,
-                'input': tool_use.input,
-                'result_preview': json.dumps(tool_result)[:500]
-            })
-            tool_results.append({
-                "type": "tool_result",
-                "tool_use_id": tool_use.id,
-                "content": json.dumps(tool_result)
+
+async def _run_tool_uses(tool_uses, result):
+    """Execute one turn's tool calls, log them on `result`, return tool_result blocks."""
+    # Tool calls within a turn are independent — run them side by side
+    outputs = await asyncio.gather(
+        *(asyncio.to_thread(dispatch_tool, tu.name, tu.input) for tu in tool_uses)
+    )
+
+    tool_results = []
+    for tool_use, tool_result in zip(tool_uses, outputs):
+        payload = json_dumps(tool_result)
+        result['tool_calls'].append({
+            'tool': tool_use.name,
+            'input': tool_use.input,
+            'result_preview': payload[:500]
+        })
+        tool_results.append({
+            "type": "tool_result",
+            "tool_use_id": tool_use.id,
+            "content": payload
+        })
+    return tool_results
+
+
+async def run_scenarios_batch(scenarios, client, poll_interval=30):
+    """Run scenarios through the Message Batches API (batch pricing, no latency SLA).
+
+    Batches cannot pause for tool results, so each round submits one batch
+    holding every unfinished conversation, runs the requested tools locally
+    and feeds the results into the next round — at most 5 rounds, matching
+    the interactive loop.
+    """
+    results = {
+        s['id']: {
+            'id': s['id'],
+            'question': s['question'],
+            'tool_calls': [],
+            'final_answer': '',
+            'validation': {'passed': False, 'details': []}
+        }
+        for s in scenarios
+    }
+    conversations = {s['id']: [{"role": "user", "content": s['question']}] for s in scenarios}
+
+    for round_no in range(1, 6):
+        if not conversations:
+            break
+        batch = await client.messages.batches.create(requests=[
+            {
+                "custom_id": scenario_id,
+                "params": {
+                    "model": MODEL,
+                    "max_tokens": 2048,
+                    "system": SYSTEM_PROMPT,
+                    "tools": _ANTHROPIC_TOOLS,
+                    "messages": messages
+                }
+            }
+            for scenario_id, messages in conversations.items()
+        ])
+        print(f"\n  Round {round_no}: batch {batch.id} with {len(conversations)} scenario(s)...")
+        while batch.processing_status != "ended":
+            await asyncio.sleep(poll_interval)
+            batch = await client.messages.batches.retrieve(batch.id)
+
+        pending = []
+        async for entry in await client.messages.batches.results(batch.id):
+            scenario_id = entry.custom_id
+            if entry.result.type != "succeeded":
+                results[scenario_id]['error'] = f"batch request {entry.result.type}"
+                conversations.pop(scenario_id)
+                continue
+
+            assistant_content = entry.result.message.content
+            conversations[scenario_id].append({
+                "role": "assistant",
+                "content": [block.model_dump(exclude_none=True) for block in assistant_content]
             })
+            tool_uses = [block for block in assistant_content if block.type == "tool_use"]
+            if not tool_uses:
+                text_blocks = [block.text for block in assistant_content if hasattr(block, 'text')]
+                results[scenario_id]['final_answer'] = '\n'.join(text_blocks)
+                conversations.pop(scenario_id)
+            else:
+                pending.append((scenario_id, tool_uses))
+
+        tool_results = await asyncio.gather(
+            *(_run_tool_uses(tool_uses, results[scenario_id]) for scenario_id, tool_uses in pending)
+        )
+        for (scenario_id, _), blocks in zip(pending, tool_results):
+            conversations[scenario_id].append({"role": "user", "content": blocks})
+
+    ordered = [results[s['id']] for s in scenarios]
+    for scenario, result in zip(scenarios, ordered):
+        _validate_answer(scenario, result)
+    return ordered
 
-        messages.append({"role": "user", "content": tool_results})
 
-    # Validate
+def _validate_answer(scenario, result):
+    """Check an LLM's final answer against the scenario's expectations."""
     if 'expected_answer_contains' in scenario:
         answer_lower = result['final_answer'].lower()
         for expected in scenario['expected_answer_contains']:
@@ -220,8 +367,6 @@ def run_scenario_interactive(scenario, api_key):
     else:
         result['validation']['passed'] = len(result['final_answer']) > 50
 
-    return result
-
 
 def print_report(results):
     """Print a formatted test report."""
@@ -265,11 +410,28 @@ def print_report(results):
     return passed == len(results)
 
 
-def main():
+def _run_direct(scenario, prefetched=None):
+    print(f"\n  Running {scenario['id']}: {scenario['question'][:50]}...", flush=True)
+    return run_scenario_direct(scenario, prefetched)
+
+
+def _run_direct_batch(scenarios):
+    """Prefetch and run a slice of direct-mode scenarios in one process."""
+    prefetched = prefetch_direct_calls(scenarios)
+    return [_run_direct(s, p) for s, p in zip(scenarios, prefetched)]
+
+
+async def amain():
     parser = argparse.ArgumentParser(description='Run Meridian Bank agent test scenarios')
     parser.add_argument('--scenario', type=str, help='Run specific scenario (e.g. A1)')
     parser.add_argument('--category', type=str, help='Run scenarios in category (e.g. B)')
     parser.add_argument('--interactive', action='store_true', help='Use LLM for scenario execution')
+    parser.add_argument('--batch', action='store_true',
+                        help='Use LLM via the Message Batches API (cheaper, not real-time)')
+    parser.add_argument('--concurrency', type=int, default=8,
+                        help='Max scenarios talking to the LLM at once (interactive mode)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Processes for direct-mode scenarios (default: 1, in-process)')
     parser.add_argument('--output', type=str, help='Save results to JSON file')
     args = parser.parse_args()
 
@@ -281,30 +443,53 @@ def main():
 
     print(f"\nRunning {len(scenarios)} scenario(s)...")
 
-    results = []
-    for scenario in scenarios:
-        print(f"\n  Running {scenario['id']}: {scenario['question'][:50]}...")
-
-        if args.interactive:
-            api_key = os.environ.get('ANTHROPIC_API_KEY')
-            if not api_key:
-                print("Error: ANTHROPIC_API_KEY environment variable required for interactive mode")
-                sys.exit(1)
-            result = run_scenario_interactive(scenario, api_key)
+    if args.interactive or args.batch:
+        api_key = os.environ.get('ANTHROPIC_API_KEY')
+        if not api_key:
+            print("Error: ANTHROPIC_API_KEY environment variable required for interactive and batch modes")
+            sys.exit(1)
+        try:
+            import anthropic
+        except ImportError:
+            print("Error: anthropic package not installed. pip install anthropic")
+            sys.exit(1)
+
+        client = anthropic.AsyncAnthropic(api_key=api_key)
+        if args.batch:
+            results = await run_scenarios_batch(scenarios, client)
         else:
-            result = run_scenario_direct(scenario)
-
-        results.append(result)
+            sem = asyncio.Semaphore(args.concurrency or 8)
+            results = await asyncio.gather(
+                *(run_scenario_interactive_async(s, client, sem) for s in scenarios)
+            )
+    else:
+        # Direct mode's cost is the tool calls themselves, so each worker takes a
+        # contiguous slice and prefetches it on one pooled connection. Workers are
+        # spawned rather than forked so none inherits this process's engine or
+        # sockets; each builds its own engine and graph lazily.
+        workers = max(1, min(args.workers or 1, len(scenarios)))
+        if workers == 1:
+            results = _run_direct_batch(scenarios)
+        else:
+            size = -(-len(scenarios) // workers)
+            batches = [scenarios[i:i + size] for i in range(0, len(scenarios), size)]
+            with ProcessPoolExecutor(max_workers=len(batches),
+                                     mp_context=multiprocessing.get_context('spawn')) as ex:
+                results = [r for batch in ex.map(_run_direct_batch, batches) for r in batch]
 
     all_passed = print_report(results)
 
     if args.output:
-        with open(args.output, 'w') as f:
-            json.dump(results, f, indent=2, default=str)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(json_dumps(results, indent=True))
         print(f"Results saved to {args.output}")
 
     sys.exit(0 if all_passed else 1)
 
 
+def main():
+    asyncio.run(amain())
+
+
 if __name__ == '__main__':
     main()
@@ -3,15 +3,46 @@ Meridian Community Bank — Data Generation Configuration
 Central configuration for all generators. Loads from db_config.yaml with defaults.
 """
 import os
+import pickle
+import sys
+from collections import namedtuple
+import numpy as np
 import yaml
 from datetime import date, datetime
 
+try:
+    from yaml import CSafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as CSafeLoader
+
 # Load YAML config
 CONFIG_PATH = os.path.join(os.path.dirname(__file__), '..', 'config', 'db_config.yaml')
+# Parsed copy of the YAML, reused while the file's (mtime, size) is unchanged
+CONFIG_CACHE_PATH = CONFIG_PATH + '.pkl'
 
 def load_config():
+    st = os.stat(CONFIG_PATH)
+    key = (st.st_mtime_ns, st.st_size)
+    try:
+        with open(CONFIG_CACHE_PATH, 'rb') as f:
+            cached_key, cfg = pickle.load(f)
+        if cached_key == key:
+            return cfg
+    except Exception:
+        pass
+
     with open(CONFIG_PATH, 'r') as f:
-        return yaml.safe_load(f)
+        cfg = yaml.load(f, Loader=CSafeLoader)
+
+    # Best effort: write-then-rename so concurrent imports never read a partial file
+    tmp_path = f"{CONFIG_CACHE_PATH}.{os.getpid()}"
+    try:
+        with open(tmp_path, 'wb') as f:
+            pickle.dump((key, cfg), f, protocol=5)
+        os.replace(tmp_path, CONFIG_CACHE_PATH)
+    except OSError:
+        pass
+    return cfg
 
 _cfg = load_config()
 
@@ -25,6 +56,12 @@ DB_URL = f"postgresql://{DB_USER}:{DB_PASS}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 
 # ── Generation parameters ────────────────────────────────────
 SEED = _cfg['generation']['seed']
+# One independent child seed per generator step, stable across processes.
+# Append new names at the end: the position picks the child stream.
+STEP_NAMES = ['reference_data', 'customers', 'accounts', 'risk', 'transactions',
+              'gl', 'treasury', 'crm', 'warehouse']
+SEED_SEQ = np.random.SeedSequence(SEED)
+STEP_SEEDS = dict(zip(STEP_NAMES, SEED_SEQ.spawn(len(STEP_NAMES))))
 CUSTOMER_COUNT = _cfg['generation']['customer_count']
 TRANSACTION_MONTHS = _cfg['generation']['transaction_months']
 TXN_DATE_START = date.fromisoformat(_cfg['generation']['transaction_date_start'])
@@ -55,6 +92,13 @@ ESTIMATED_ACCOUNTS = int(PERSONAL_CUSTOMERS * 1.7 + BUSINESS_CUSTOMERS * 2.5)
 
 # ── Batch sizes for bulk inserts ─────────────────────────────
 BATCH_SIZE = 5000
+# Loads smaller than this use one multi-row INSERT instead of COPY
+COPY_THRESHOLD = 1000
+
+# ── Progress bars ────────────────────────────────────────────
+# Row-level loops refresh at most once a second, and stay silent when stderr
+# isn't a terminal (logs, spawned workers)
+PROGRESS_OPTS = dict(mininterval=1.0, miniters=10000, disable=not sys.stderr.isatty())
 
 # ── UK-specific constants ────────────────────────────────────
 UK_REGIONS = [
@@ -70,8 +114,8 @@ CUSTOMER_SEGMENTS = [
 ]
 
 # ── Product definitions ──────────────────────────────────────
-PRODUCTS = [
-    # (code, name, category, rate, currency, min_balance, launched)
+Product = namedtuple('Product', 'code name category rate currency min_balance launched')
+PRODUCTS = tuple(Product(*row) for row in [
     ('CA-STD-001', 'Meridian Current Account', 'current_account', 0.0, 'GBP', 0, '2015-01-01'),
     ('CA-PRM-001', 'Meridian Premium Current', 'current_account', 0.005, 'GBP', 5000, '2018-03-01'),
     ('CA-STU-001', 'Student Current Account', 'current_account', 0.0, 'GBP', 0, '2016-09-01'),
@@ -93,11 +137,11 @@ PRODUCTS = [
     ('BL-SME-001', 'SME Business Loan', 'business_loan', 0.079, 'GBP', 0, '2015-01-01'),
     ('BL-GRO-001', 'Growth Finance Loan', 'business_loan', 0.065, 'GBP', 0, '2021-01-01'),
     ('BS-SME-001', 'Business Savings Account', 'business_savings', 0.035, 'GBP', 1, '2015-01-01'),
-]
+])
 
 # ── Chart of Accounts structure ──────────────────────────────
-# (code, name, type, subtype, parent, level)
-CHART_OF_ACCOUNTS = [
+CoaEntry = namedtuple('CoaEntry', 'code name type subtype parent level')
+CHART_OF_ACCOUNTS = tuple(CoaEntry(*row) for row in [
     # Level 0 — Top level
     ('1000', 'Assets', 'asset', None, None, 0),
     ('2000', 'Liabilities', 'liability', None, None, 0),
@@ -170,10 +214,11 @@ CHART_OF_ACCOUNTS = [
     ('5110', 'Interest on Deposits', 'expense', 'interest', '5100', 2),
     ('5120', 'Interest on Wholesale Funding', 'expense', 'interest', '5100', 2),
     ('5130', 'Interest on Subordinated Debt', 'expense', 'interest', '5100', 2),
-]
+])
 
 # ── Cost Centres ─────────────────────────────────────────────
-COST_CENTRES = [
+CostCentre = namedtuple('CostCentre', 'code name department manager')
+COST_CENTRES = tuple(CostCentre(*row) for row in [
     ('CC-EXC', 'Executive Office', 'Executive', 'CEO'),
     ('CC-RET', 'Retail Banking', 'Retail', 'Head of Retail'),
     ('CC-BUS', 'Business Banking', 'Business', 'Head of Business'),
@@ -194,10 +239,11 @@ COST_CENTRES = [
     ('CC-BR3', 'Birmingham Branch', 'Branch', 'Branch Manager Birmingham'),
     ('CC-BR4', 'Edinburgh Branch', 'Branch', 'Branch Manager Edinburgh'),
     ('CC-BR5', 'Bristol Branch', 'Branch', 'Branch Manager Bristol'),
-]
+])
 
 # ── Payment Schemes ──────────────────────────────────────────
-PAYMENT_SCHEMES = [
+PaymentScheme = namedtuple('PaymentScheme', 'code name type max_amount settlement_cycle operating_hours')
+PAYMENT_SCHEMES = tuple(PaymentScheme(*row) for row in [
     ('FPS', 'Faster Payments', 'real_time', 250000, 'Near instant', '24/7'),
     ('BACS', 'BACS Direct Credit', 'batch', None, '3 working days', 'Working days'),
     ('DD', 'Direct Debit', 'batch', None, '3 working days', 'Working days'),
@@ -208,10 +254,11 @@ PAYMENT_SCHEMES = [
     ('SO', 'Standing Order', 'batch', None, 'Scheduled', 'As scheduled'),
     ('LINK', 'LINK ATM Network', 'real_time', 500, 'Instant', '24/7'),
     ('SEPA', 'SEPA Credit Transfer', 'batch', None, '1-2 working days', 'Working days'),
-]
+])
 
 # ── Branches ─────────────────────────────────────────────────
-BRANCHES = [
+Branch = namedtuple('Branch', 'code name region city postcode type')
+BRANCHES = tuple(Branch(*row) for row in [
     ('BR-LON-01', 'London City', 'London', 'London', 'EC2V 8AS', 'full_service'),
     ('BR-LON-02', 'London West End', 'London', 'London', 'W1D 3QR', 'full_service'),
     ('BR-MAN-01', 'Manchester Deansgate', 'North West', 'Manchester', 'M3 4LQ', 'full_service'),
@@ -222,4 +269,4 @@ BRANCHES = [
     ('BR-CAR-01', 'Cardiff Queen St', 'Wales', 'Cardiff', 'CF10 2BU', 'full_service'),
     ('BR-DIG-01', 'Digital Hub', 'London', 'London', 'EC1V 9NR', 'digital_hub'),
     ('BR-HQ-01', 'Head Office', 'London', 'London', 'EC2N 1HQ', 'head_office'),
-]
+])
@@ -3,151 +3,173 @@ Generate accounts for Meridian Community Bank customers.
 ~85,000 accounts across all product types with realistic distributions.
 """
 import numpy as np
-from datetime import date, timedelta
-from tqdm import tqdm
+from itertools import repeat
 from sqlalchemy import text
 from generators.config import (
-    SEED, ACTIVE_ACCOUNT_RATIO, ARREARS_RATIO, ORPHANED_ACCOUNTS
+    STEP_SEEDS, ACTIVE_ACCOUNT_RATIO, ARREARS_RATIO, ORPHANED_ACCOUNTS
 )
 from generators.utils.relationships import bulk_insert, registry, get_engine
-from generators.utils.faker_extensions import generate_sort_code, generate_account_number
+from generators.utils.faker_extensions import MERIDIAN_SORT_CODES
+
+# Customer onboarding dates are drawn as day offsets from here; no account
+# opens after LATEST_OPENED_DATE
+ACCOUNT_EPOCH = np.datetime64('2015-01-01', 'D')
+LATEST_OPENED_DATE = np.datetime64('2024-12-31', 'D')
+
+CREDIT_LIMITS = [1000, 2000, 3000, 5000, 7500, 10000, 15000]
+OVERDRAFT_LIMITS = [250, 500, 1000, 1500, 2000, 3000]
+
+# Streams for account numbers/orphans, personal and business cohorts
+_SHARED_SEED, _PERSONAL_SEED, _BUSINESS_SEED = STEP_SEEDS['accounts'].spawn(3)
+
+# Column order of the account tuples built below
+ACCOUNT_COLUMNS = ['customer_id', 'product_id', 'account_number', 'sort_code', 'account_name',
+                   'status', 'currency', 'credit_limit', 'overdraft_limit', 'opened_date',
+                   'closed_date', 'last_transaction_date']
 
 
 def generate_accounts():
     """Generate account records linked to customers and products."""
-    rng = np.random.default_rng(SEED + 10)
+    rng = np.random.default_rng(_SHARED_SEED)
 
     personal_ids = registry.get_ids('personal_customer_ids')
     business_ids = registry.get_ids('business_customer_ids')
 
-    # Get product IDs by category
-    engine = get_engine()
-    with engine.connect() as conn:
-        products = conn.execute(text(
-            "SELECT product_id, category FROM core_banking.products"
-        )).fetchall()
-    products_by_cat = {}
-    for pid, cat in products:
-        products_by_cat.setdefault(cat, []).append(pid)
+    # Product IDs by category, registered by the reference-data step
+    products_by_cat = registry.get_ids('products_by_category')[0]
+    credit_card_pids = products_by_cat['credit_card']
 
     records = []
-    used_account_numbers = set()
-
-    def make_unique_account(rng):
-        while True:
-            sc = generate_sort_code(rng)
-            an = generate_account_number(rng)
-            key = f"{an}-{sc}"
-            if key not in used_account_numbers:
-                used_account_numbers.add(key)
-                return an, sc
+    sort_codes = np.array(MERIDIAN_SORT_CODES)
+    # (sort code index, account number) packed as sort_idx * 10**8 + number
+    issued = np.empty(0, dtype=np.int64)
+
+    def make_unique_accounts(n):
+        """Draw n (account_number, sort_code) pairs not issued before."""
+        nonlocal issued
+        fresh = np.empty(0, dtype=np.int64)
+        while len(fresh) < n:
+            draw = int((n - len(fresh)) * 1.05) + 8
+            keys = (rng.integers(0, len(sort_codes), size=draw) * 10**8
+                    + rng.integers(10000000, 99999999, size=draw))
+            keys = np.concatenate([fresh, keys])
+            _, first = np.unique(keys, return_index=True)
+            keys = keys[np.sort(first)]  # dedupe, keeping draw order
+            fresh = keys[~np.isin(keys, issued)]
+        fresh = fresh[:n]
+        issued = np.concatenate([issued, fresh])
+        return (fresh % 10**8).astype(str), sort_codes[fresh // 10**8]
+
+    def add_accounts(rng, cids, pids, statuses, opened_days):
+        """Append one account per customer from column arrays (days since ACCOUNT_EPOCH)."""
+        n = len(cids)
+        ans, scs = make_unique_accounts(n)
+        opened = np.minimum(ACCOUNT_EPOCH + opened_days.astype('timedelta64[D]'),
+                            LATEST_OPENED_DATE)
+        closed = opened + rng.integers(90, 2000, size=n).astype('timedelta64[D]')
+        closed = np.where(statuses == 'closed', closed.astype(str), None)
+        # Credit cards get a limit; any account may have an overdraft
+        credit = np.where(np.isin(pids, credit_card_pids),
+                          rng.choice(CREDIT_LIMITS, size=n).astype(float), None)
+        overdraft = np.where(rng.random(n) < 0.3,
+                             rng.choice(OVERDRAFT_LIMITS, size=n).astype(float), None)
+        records.extend(zip(
+            cids.tolist(), pids.tolist(), ans.tolist(), scs.tolist(), repeat(None),
+            statuses.tolist(), repeat('GBP'), credit.tolist(), overdraft.tolist(),
+            opened.astype(str).tolist(), closed.tolist(), repeat(None),
+        ))
+
+    # Every per-customer draw is independent, so each one is taken for the
+    # whole cohort at once and records are built per product from the masks.
 
     # ── Personal customers ────────────────────────────────
     # Each gets: 1 current account (100%), savings (60%), loan/mortgage (20%), card (30%)
     print(f"  Generating accounts for {len(personal_ids)} personal customers...")
-    for cid in tqdm(personal_ids, desc="  Personal accounts", leave=False):
-        onboarded_offset = rng.integers(0, 3650)
-        base_date = date(2015, 1, 1) + timedelta(days=int(onboarded_offset))
-        if base_date > date(2024, 12, 31):
-            base_date = date(2024, 12, 31)
-
-        # Current account (always)
-        an, sc = make_unique_account(rng)
-        status = 'active' if rng.random() < ACTIVE_ACCOUNT_RATIO else rng.choice(['dormant', 'closed'])
-        records.append(_make_account(int(cid), rng.choice(products_by_cat['current_account']),
-                                      an, sc, status, base_date, rng))
-
-        # Savings (60%)
-        if rng.random() < 0.60:
-            an, sc = make_unique_account(rng)
-            cat = rng.choice(['savings'] * 3)
-            records.append(_make_account(int(cid), rng.choice(products_by_cat['savings']),
-                                          an, sc, 'active', base_date + timedelta(days=int(rng.integers(0, 365))), rng))
-
-        # Loan or mortgage (20%)
-        if rng.random() < 0.20:
-            an, sc = make_unique_account(rng)
-            cat = rng.choice(['personal_loan', 'mortgage'], p=[0.6, 0.4])
-            status = 'active'
-            if rng.random() < ARREARS_RATIO:
-                status = rng.choice(['in_arrears', 'default'], p=[0.8, 0.2])
-            records.append(_make_account(int(cid), rng.choice(products_by_cat[cat]),
-                                          an, sc, status, base_date + timedelta(days=int(rng.integers(30, 1000))), rng))
-
-        # Credit card (30%)
-        if rng.random() < 0.30:
-            an, sc = make_unique_account(rng)
-            records.append(_make_account(int(cid), rng.choice(products_by_cat['credit_card']),
-                                          an, sc, 'active', base_date + timedelta(days=int(rng.integers(0, 730))), rng))
+    prng = np.random.default_rng(_PERSONAL_SEED)
+    n = len(personal_ids)
+    base_days = prng.integers(0, 3650, size=n)
+
+    # Current account (always)
+    status = np.where(prng.random(n) < ACTIVE_ACCOUNT_RATIO, 'active',
+                      prng.choice(['dormant', 'closed'], size=n))
+    add_accounts(prng, personal_ids,
+                 prng.choice(products_by_cat['current_account'], size=n), status, base_days)
+
+    # Savings (60%)
+    has = prng.random(n) < 0.60
+    k = int(has.sum())
+    add_accounts(prng, personal_ids[has],
+                 prng.choice(products_by_cat['savings'], size=k), np.full(k, 'active'),
+                 base_days[has] + prng.integers(0, 365, size=k))
+
+    # Loan or mortgage (20%)
+    has = prng.random(n) < 0.20
+    k = int(has.sum())
+    is_mortgage = prng.random(k) < 0.40
+    pids = np.where(is_mortgage,
+                    prng.choice(products_by_cat['mortgage'], size=k),
+                    prng.choice(products_by_cat['personal_loan'], size=k))
+    status = np.where(prng.random(k) < ARREARS_RATIO,
+                      prng.choice(['in_arrears', 'default'], size=k, p=[0.8, 0.2]), 'active')
+    add_accounts(prng, personal_ids[has], pids, status,
+                 base_days[has] + prng.integers(30, 1000, size=k))
+
+    # Credit card (30%)
+    has = prng.random(n) < 0.30
+    k = int(has.sum())
+    add_accounts(prng, personal_ids[has],
+                 prng.choice(products_by_cat['credit_card'], size=k), np.full(k, 'active'),
+                 base_days[has] + prng.integers(0, 730, size=k))
 
     # ── Business customers ────────────────────────────────
     # Each gets: 1 business current (100%), business savings (50%), business loan (30%)
     print(f"  Generating accounts for {len(business_ids)} business customers...")
-    for cid in tqdm(business_ids, desc="  Business accounts", leave=False):
-        onboarded_offset = rng.integers(0, 3650)
-        base_date = date(2015, 1, 1) + timedelta(days=int(onboarded_offset))
-        if base_date > date(2024, 12, 31):
-            base_date = date(2024, 12, 31)
-
-        # Business current (always)
-        an, sc = make_unique_account(rng)
-        records.append(_make_account(int(cid), rng.choice(products_by_cat['business_current']),
-                                      an, sc, 'active', base_date, rng))
-
-        # Business savings (50%)
-        if rng.random() < 0.50:
-            an, sc = make_unique_account(rng)
-            records.append(_make_account(int(cid), rng.choice(products_by_cat['business_savings']),
-                                          an, sc, 'active', base_date + timedelta(days=int(rng.integers(0, 365))), rng))
-
-        # Business loan (30%)
-        if rng.random() < 0.30:
-            an, sc = make_unique_account(rng)
-            status = 'active'
-            if rng.random() < ARREARS_RATIO:
-                status = 'in_arrears'
-            records.append(_make_account(int(cid), rng.choice(products_by_cat['business_loan']),
-                                          an, sc, status, base_date + timedelta(days=int(rng.integers(30, 730))), rng))
+    brng = np.random.default_rng(_BUSINESS_SEED)
+    n = len(business_ids)
+    base_days = brng.integers(0, 3650, size=n)
+
+    # Business current (always)
+    add_accounts(brng, business_ids,
+                 brng.choice(products_by_cat['business_current'], size=n), np.full(n, 'active'),
+                 base_days)
+
+    # Business savings (50%)
+    has = brng.random(n) < 0.50
+    k = int(has.sum())
+    add_accounts(brng, business_ids[has],
+                 brng.choice(products_by_cat['business_savings'], size=k), np.full(k, 'active'),
+                 base_days[has] + brng.integers(0, 365, size=k))
+
+    # Business loan (30%)
+    has = brng.random(n) < 0.30
+    k = int(has.sum())
+    status = np.where(brng.random(k) < ARREARS_RATIO, 'in_arrears', 'active')
+    add_accounts(brng, business_ids[has],
+                 brng.choice(products_by_cat['business_loan'], size=k), status,
+                 base_days[has] + brng.integers(30, 730, size=k))
 
     # ── Orphaned accounts (intentional DQ issue) ──────────
     max_customer_id = int(max(personal_ids.max(), business_ids.max()))
-    for i in range(ORPHANED_ACCOUNTS):
-        an, sc = make_unique_account(rng)
+    ans, scs = make_unique_accounts(ORPHANED_ACCOUNTS)
+    for i, (an, sc) in enumerate(zip(ans.tolist(), scs.tolist())):
         fake_cid = max_customer_id + 1000 + i  # Non-existent customer
-        records.append({
-            'customer_id': fake_cid,
-            'product_id': int(rng.choice(products_by_cat['current_account'])),
-            'account_number': an,
-            'sort_code': sc,
-            'account_name': f'Orphaned Account {i+1}',
-            'status': 'active',
-            'currency': 'GBP',
-            'credit_limit': None,
-            'overdraft_limit': None,
-            'opened_date': '2023-06-15',
-            'closed_date': None,
-            'last_transaction_date': None,
-        })
-
-    # Need to temporarily disable FK constraint for orphaned accounts
-    with engine.connect() as conn:
-        conn.execute(text("ALTER TABLE core_banking.accounts DROP CONSTRAINT IF EXISTS accounts_customer_id_fkey"))
-        conn.commit()
+        records.append((
+            fake_cid, int(rng.choice(products_by_cat['current_account'])), an, sc,
+            f'Orphaned Account {i+1}', 'active', 'GBP', None, None, '2023-06-15', None, None,
+        ))
 
-    cols = ['customer_id', 'product_id', 'account_number', 'sort_code', 'account_name',
-            'status', 'currency', 'credit_limit', 'overdraft_limit', 'opened_date',
-            'closed_date', 'last_transaction_date']
+    # Drop the FK for orphaned accounts, load, and re-add it (without validating
+    # existing rows) in one transaction
+    engine = get_engine()
     print(f"  Inserting {len(records)} accounts...")
-    bulk_insert('core_banking.accounts', records, cols)
-
-    # Re-add FK (won't validate existing data)
-    with engine.connect() as conn:
+    with engine.begin() as conn:
+        conn.execute(text("ALTER TABLE core_banking.accounts DROP CONSTRAINT IF EXISTS accounts_customer_id_fkey"))
+        bulk_insert('core_banking.accounts', records, ACCOUNT_COLUMNS, conn=conn)
         conn.execute(text("""
             ALTER TABLE core_banking.accounts
             ADD CONSTRAINT accounts_customer_id_fkey
             FOREIGN KEY (customer_id) REFERENCES core_banking.customers(customer_id) NOT VALID
         """))
-        conn.commit()
 
     # Retrieve and register account IDs
     with engine.connect() as conn:
@@ -157,50 +179,21 @@ def generate_accounts():
 
     all_ids = [r[0] for r in rows]
     active_ids = [r[0] for r in rows if r[1] in ['active', 'in_arrears']]
-    account_customer_map = {r[0]: r[1] for r in rows}
+    # account_id -> customer_id as a structured array sorted by account_id;
+    # look up with m['customer_id'][np.searchsorted(m['account_id'], aids)]
+    account_customer_map = np.fromiter(
+        ((r[0], r[1]) for r in rows),
+        dtype=[('account_id', 'i8'), ('customer_id', 'i8')], count=len(rows),
+    )
 
     registry.register('account_ids', all_ids)
     registry.register('active_account_ids', active_ids)
-    registry.register('account_customer_map', [account_customer_map])
+    registry.register('account_customer_map', account_customer_map)
 
     print(f"  ✓ Accounts: {len(all_ids)} total ({len(active_ids)} active, {ORPHANED_ACCOUNTS} orphaned)")
     return all_ids
 
 
-def _make_account(customer_id, product_id, account_number, sort_code, status, opened_date, rng):
-    """Helper to create an account record."""
-    if opened_date > date(2024, 12, 31):
-        opened_date = date(2024, 12, 31)
-
-    closed_date = None
-    if status == 'closed':
-        closed_date = (opened_date + timedelta(days=int(rng.integers(90, 2000)))).isoformat()
-
-    credit_limit = None
-    overdraft_limit = None
-    # Credit cards get a limit
-    if product_id in range(15, 17):  # Rough range for credit cards
-        credit_limit = float(rng.choice([1000, 2000, 3000, 5000, 7500, 10000, 15000]))
-    # Current accounts may have overdraft
-    if rng.random() < 0.3:
-        overdraft_limit = float(rng.choice([250, 500, 1000, 1500, 2000, 3000]))
-
-    return {
-        'customer_id': customer_id,
-        'product_id': int(product_id),
-        'account_number': account_number,
-        'sort_code': sort_code,
-        'account_name': None,
-        'status': status,
-        'currency': 'GBP',
-        'credit_limit': credit_limit,
-        'overdraft_limit': overdraft_limit,
-        'opened_date': opened_date.isoformat(),
-        'closed_date': closed_date,
-        'last_transaction_date': None,
-    }
-
-
 def run():
     """Generate all account data."""
     print("\n🏦 Generating account data...")
@@ -2,6 +2,7 @@
 """
 Meridian Community Bank — Master Data Generation Orchestrator
 Runs all generators in dependency order to build the complete test data environment.
+Independent steps (e.g. Risk, Treasury, CRM) run concurrently in worker processes.
 
 Usage:
     python generate_all.py              # Full generation
@@ -12,16 +13,21 @@ import sys
 import os
 import time
 import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
 
 # Add project root to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from generators.utils.relationships import get_engine, execute_sql_file
-from sqlalchemy import text
+# Generator, SQLAlchemy and NumPy imports are deferred to the functions that
+# need them so `--help` and argument errors return immediately.
 
 
 def setup_database():
     """Create all schemas and tables from DDL files."""
+    from sqlalchemy import text
+    from generators.utils.relationships import get_engine, execute_sql_file
+
     print("=" * 60)
     print("🏦 MERIDIAN COMMUNITY BANK — Data Environment Setup")
     print("=" * 60)
@@ -43,11 +49,10 @@ def setup_database():
 
     # Drop and recreate schemas for clean run
     print("\n🗑️  Dropping existing schemas...")
-    with engine.connect() as conn:
-        for schema in ['warehouse_reporting', 'warehouse_core', 'warehouse_staging',
-                       'payments', 'treasury', 'gl', 'risk', 'crm', 'core_banking']:
-            conn.execute(text(f"DROP SCHEMA IF EXISTS {schema} CASCADE"))
-        conn.commit()
+    schemas = ['warehouse_reporting', 'warehouse_core', 'warehouse_staging',
+               'payments', 'treasury', 'gl', 'risk', 'crm', 'core_banking']
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {', '.join(schemas)} CASCADE"))
     print("  ✓ Clean slate")
 
     # Execute DDL files in order
@@ -72,19 +77,40 @@ def setup_database():
     print("\n✅ Database schema created successfully")
 
 
+# (step, label, module, prerequisite steps whose tables or registry IDs it reads)
+STEPS = [
+    (1, "Reference Data", "generators.generate_reference_data", ()),
+    (2, "Customers & Addresses", "generators.generate_customers", (1,)),
+    (3, "Accounts", "generators.generate_accounts", (1, 2)),
+    (4, "Risk & Compliance", "generators.generate_risk_data", (1, 2)),
+    (5, "Transactions", "generators.generate_transactions", (3,)),
+    (6, "General Ledger", "generators.generate_gl_entries", (1,)),
+    (7, "Treasury", "generators.generate_treasury", ()),
+    (8, "CRM Data", "generators.generate_crm_data", (2,)),
+    (9, "Warehouse (Staging → Core → Reporting)", "generators.generate_warehouse",
+     (4, 5, 6, 7, 8)),
+]
+
+
+def _run_step(module_name, registered):
+    """Run one generator in a worker process.
+
+    The worker starts from the parent's registry and hands back whatever the
+    step registered, so later steps see the same IDs as a sequential run.
+    """
+    from generators.utils.relationships import registry
+    registry.merge(registered)
+    step_start = time.time()
+    module = __import__(module_name, fromlist=['run'])
+    module.run()
+    new_ids = {k: v for k, v in registry.snapshot().items()
+               if registered.get(k) is not v}
+    return new_ids, time.time() - step_start
+
+
 def run_generators(start_step=1):
-    """Run data generators in dependency order."""
-    steps = [
-        (1, "Reference Data", "generators.generate_reference_data"),
-        (2, "Customers & Addresses", "generators.generate_customers"),
-        (3, "Accounts", "generators.generate_accounts"),
-        (4, "Risk & Compliance", "generators.generate_risk_data"),
-        (5, "Transactions", "generators.generate_transactions"),
-        (6, "General Ledger", "generators.generate_gl_entries"),
-        (7, "Treasury", "generators.generate_treasury"),
-        (8, "CRM Data", "generators.generate_crm_data"),
-        (9, "Warehouse (Staging → Core → Reporting)", "generators.generate_warehouse"),
-    ]
+    """Run data generators, in parallel where the dependency graph allows."""
+    from generators.utils.relationships import registry
 
     print("\n" + "=" * 60)
     print("📊 DATA GENERATION")
@@ -92,27 +118,45 @@ def run_generators(start_step=1):
 
     total_start = time.time()
 
-    for step_num, label, module_name in steps:
+    done = set()
+    pending = {}
+    for step_num, label, module_name, deps in STEPS:
         if step_num < start_step:
             print(f"\n⏭️  Step {step_num}: {label} (skipped)")
-            continue
-
-        step_start = time.time()
-        print(f"\n{'─' * 60}")
-        print(f"Step {step_num}/{len(steps)}: {label}")
-        print(f"{'─' * 60}")
-
-        try:
-            module = __import__(module_name, fromlist=['run'])
-            module.run()
-            elapsed = time.time() - step_start
-            print(f"⏱️  Step {step_num} completed in {elapsed:.1f}s")
-        except Exception as e:
-            print(f"\n✗ Step {step_num} failed: {e}")
-            import traceback
-            traceback.print_exc()
-            print("\nYou can resume from this step with: python generate_all.py --step", step_num)
-            sys.exit(1)
+            done.add(step_num)
+        else:
+            pending[step_num] = (label, module_name, deps)
+
+    # Spawned (not forked) workers so none inherit the parent's open DB connections
+    workers = max(1, (os.cpu_count() or 2) // 2)
+    running = {}
+    with ProcessPoolExecutor(max_workers=workers,
+                             mp_context=multiprocessing.get_context('spawn')) as pool:
+        while pending or running:
+            ready = [n for n, (_, _, deps) in pending.items() if done.issuperset(deps)]
+            for step_num in ready:
+                label, module_name, _ = pending.pop(step_num)
+                print(f"\n{'─' * 60}")
+                print(f"Step {step_num}/{len(STEPS)}: {label}")
+                print(f"{'─' * 60}")
+                future = pool.submit(_run_step, module_name, registry.snapshot())
+                running[future] = step_num
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                step_num = running.pop(future)
+                try:
+                    new_ids, elapsed = future.result()
+                except Exception as e:
+                    print(f"\n✗ Step {step_num} failed: {e}")
+                    import traceback
+                    traceback.print_exc()
+                    print("\nYou can resume from this step with: python generate_all.py --step", step_num)
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    sys.exit(1)
+                registry.merge(new_ids)
+                done.add(step_num)
+                print(f"⏱️  Step {step_num} completed in {elapsed:.1f}s")
 
     total_elapsed = time.time() - total_start
     print_summary(total_elapsed)
@@ -120,6 +164,9 @@ def run_generators(start_step=1):
 
 def print_summary(elapsed):
     """Print final summary of generated data."""
+    from sqlalchemy import text
+    from generators.utils.relationships import get_engine
+
     engine = get_engine()
 
     print("\n" + "=" * 60)
@@ -146,24 +193,34 @@ def print_summary(elapsed):
                                 'rpt_regulatory_capital', 'rpt_arrears_ageing'],
     }
 
-    total_rows = 0
-    with engine.connect() as conn:
-        for schema, tables in schemas.items():
-            print(f"\n  {schema}:")
-            for table in tables:
-                try:
-                    count = conn.execute(text(f"SELECT COUNT(*) FROM {schema}.{table}")).scalar()
-                    total_rows += count
-                    print(f"    {table:.<40} {count:>12,}")
-                except Exception:
-                    print(f"    {table:.<40} {'(empty)':>12}")
-
-    # Database size
+    # Exact counts in one round-trip: a UNION ALL over the tables that exist
+    names = [f"{schema}.{table}" for schema, tables in schemas.items() for table in tables]
     with engine.connect() as conn:
+        existing = conn.execute(text(
+            "SELECT n FROM unnest(CAST(:names AS text[])) AS n WHERE to_regclass(n) IS NOT NULL"
+        ), {'names': names}).scalars().all()
+        counts = {}
+        if existing:
+            counts = dict(conn.execute(text(" UNION ALL ".join(
+                f"SELECT '{name}', COUNT(*) FROM {name}" for name in existing
+            ))).fetchall())
+
+        # Database size
         size = conn.execute(text(
             "SELECT pg_size_pretty(pg_database_size('meridian_bank'))"
         )).scalar()
 
+    total_rows = 0
+    for schema, tables in schemas.items():
+        print(f"\n  {schema}:")
+        for table in tables:
+            count = counts.get(f"{schema}.{table}")
+            if count is None:
+                print(f"    {table:.<40} {'(empty)':>12}")
+            else:
+                total_rows += count
+                print(f"    {table:.<40} {count:>12,}")
+
     print(f"\n{'─' * 60}")
     print(f"  Total rows: {total_rows:,}")
     print(f"  Database size: {size}")
@@ -1,17 +1,30 @@
 """
 Generate CRM data: contacts, interactions, complaints, marketing consents, segments.
 """
+import functools
 import numpy as np
-from datetime import date, timedelta
 from faker import Faker
 from tqdm import tqdm
-from generators.config import SEED, COMPLAINT_RATIO, CUSTOMER_SEGMENTS
-from generators.utils.relationships import bulk_insert, registry, get_engine
+from generators.config import SEED, COMPLAINT_RATIO, CUSTOMER_SEGMENTS, PROGRESS_OPTS
+from generators.utils.relationships import (
+    bulk_insert, registry, get_engine, reserve_ids, run_parallel, indexes_dropped
+)
 from generators.utils.faker_extensions import generate_uk_phone
 
 fake = Faker('en_GB')
 Faker.seed(SEED)
 
+TEXT_POOL_SIZE = 2000
+
+
+@functools.lru_cache(maxsize=1)
+def _text_pools():
+    """Faker sentences and paragraphs, built on first use and sampled by index."""
+    sentences = np.array([fake.sentence(nb_words=6) for _ in range(TEXT_POOL_SIZE)], dtype=object)
+    paragraphs = np.array([fake.paragraph(nb_sentences=2) for _ in range(TEXT_POOL_SIZE)],
+                          dtype=object)
+    return sentences, paragraphs
+
 
 def generate_contacts():
     """Generate CRM contact records linked to customers."""
@@ -25,34 +38,43 @@ def generate_contacts():
         )).fetchall()
 
     records = []
-    branches = ['London City', 'London West End', 'Manchester', 'Birmingham',
-                'Edinburgh', 'Bristol', 'Leeds', 'Cardiff', 'Digital Hub']
-    channels = ['email', 'phone', 'sms', 'post', 'app']
-    rm_names = [f'RM-{i:03d}' for i in range(1, 30)]
-
-    for cid, name, email, phone in tqdm(customers, desc="  CRM contacts", leave=False):
-        records.append({
-            'customer_id': cid,
-            'contact_name': name,
-            'email_primary': email,
-            'email_secondary': fake.email() if rng.random() > 0.8 else None,
-            'phone_primary': phone,
-            'phone_secondary': generate_uk_phone() if rng.random() > 0.7 else None,
-            'preferred_channel': rng.choice(channels, p=[0.35, 0.20, 0.15, 0.05, 0.25]),
-            'language_pref': 'en',
-            'relationship_manager': rng.choice(rm_names),
-            'assigned_branch': rng.choice(branches),
-        })
-
-    cols = ['customer_id', 'contact_name', 'email_primary', 'email_secondary',
+    branches = np.array(['London City', 'London West End', 'Manchester', 'Birmingham',
+                         'Edinburgh', 'Bristol', 'Leeds', 'Cardiff', 'Digital Hub'], dtype=object)
+    channels = np.array(['email', 'phone', 'sms', 'post', 'app'], dtype=object)
+    chan_cdf = np.cumsum([0.35, 0.20, 0.15, 0.05, 0.25])
+    chan_cdf /= chan_cdf[-1]
+    rm_names = np.array([f'RM-{i:03d}' for i in range(1, 30)], dtype=object)
+    contact_ids = reserve_ids('crm.contacts', 'contact_id', len(customers))
+
+    # Random columns are drawn for all contacts at once; only Faker fields stay per row
+    n = len(customers)
+    has_email2 = (rng.random(n) > 0.8).tolist()
+    has_phone2 = (rng.random(n) > 0.7).tolist()
+    preferred = channels[np.searchsorted(chan_cdf, rng.random(n), side='right')].tolist()
+    managers = rm_names[rng.integers(0, len(rm_names), size=n)].tolist()
+    assigned = branches[rng.integers(0, len(branches), size=n)].tolist()
+
+    for contact_id, (cid, name, email, phone), email2, phone2, channel, rm, branch in zip(
+            contact_ids, tqdm(customers, desc="  CRM contacts", leave=False, **PROGRESS_OPTS),
+            has_email2, has_phone2, preferred, managers, assigned):
+        records.append((
+            contact_id, cid, name, email,
+            fake.email() if email2 else None,
+            phone,
+            generate_uk_phone() if phone2 else None,
+            channel,
+            'en',
+            rm,
+            branch,
+        ))
+
+    cols = ['contact_id', 'customer_id', 'contact_name', 'email_primary', 'email_secondary',
             'phone_primary', 'phone_secondary', 'preferred_channel', 'language_pref',
             'relationship_manager', 'assigned_branch']
     bulk_insert('crm.contacts', records, cols)
 
     # Register contact IDs
-    with engine.connect() as conn:
-        contact_rows = conn.execute(text("SELECT contact_id, customer_id FROM crm.contacts")).fetchall()
-    contact_map = {r[1]: r[0] for r in contact_rows}
+    contact_map = {cid: contact_id for contact_id, cid, *_ in records}
     registry.register('contact_map', [contact_map])
     print(f"  ✓ CRM Contacts: {len(records)} generated")
 
@@ -65,41 +87,52 @@ def generate_interactions():
     from sqlalchemy import text
     with engine.connect() as conn:
         contacts = conn.execute(text(
-            "SELECT contact_id, customer_id FROM crm.contacts"
+            "SELECT contact_id, customer_id FROM crm.contacts ORDER BY contact_id"
         )).fetchall()
 
-    channels = ['phone_inbound', 'phone_outbound', 'email_inbound', 'email_outbound',
-                'branch_visit', 'webchat', 'app_message', 'letter']
-    chan_weights = np.array([0.20, 0.10, 0.15, 0.10, 0.08, 0.15, 0.17, 0.05])
-    categories = ['enquiry', 'service_request', 'product_enquiry', 'account_maintenance',
-                  'complaint', 'feedback', 'outbound_campaign']
-    cat_weights = np.array([0.30, 0.20, 0.15, 0.15, 0.05, 0.05, 0.10])
-
-    records = []
-    # Average 4 interactions per customer
-    for contact_id, customer_id in tqdm(contacts, desc="  Interactions", leave=False):
-        n = max(0, int(rng.poisson(4)))
-        for _ in range(n):
-            int_date = date(2024, 1, 1) + timedelta(days=int(rng.integers(0, 365)))
-            records.append({
-                'contact_id': contact_id,
-                'customer_id': customer_id,
-                'interaction_date': f'{int_date.isoformat()} {rng.integers(8,18):02d}:{rng.integers(0,59):02d}:00',
-                'channel': rng.choice(channels, p=chan_weights),
-                'category': rng.choice(categories, p=cat_weights),
-                'subject': fake.sentence(nb_words=6),
-                'resolved': bool(rng.random() > 0.15),
-                'handled_by': f'AGENT-{rng.integers(1, 50):03d}',
-                'duration_seconds': int(rng.lognormal(5, 0.8)) if rng.random() > 0.3 else None,
-                'sentiment_score': round(float(rng.uniform(-0.5, 1.0)), 2),
-            })
+    # Categorical pools are object arrays, so sampled rows share one str per
+    # distinct value instead of each getting its own copy; weighted columns
+    # search a CDF built once rather than revalidating weights per draw
+    channels = np.array(['phone_inbound', 'phone_outbound', 'email_inbound', 'email_outbound',
+                         'branch_visit', 'webchat', 'app_message', 'letter'], dtype=object)
+    chan_cdf = np.cumsum([0.20, 0.10, 0.15, 0.10, 0.08, 0.15, 0.17, 0.05])
+    chan_cdf /= chan_cdf[-1]
+    categories = np.array(['enquiry', 'service_request', 'product_enquiry', 'account_maintenance',
+                           'complaint', 'feedback', 'outbound_campaign'], dtype=object)
+    cat_cdf = np.cumsum([0.30, 0.20, 0.15, 0.15, 0.05, 0.05, 0.10])
+    cat_cdf /= cat_cdf[-1]
+    agents = np.array([f'AGENT-{i:03d}' for i in range(1, 50)], dtype=object)
+    subjects, _ = _text_pools()
+
+    # Average 4 interactions per customer; every column is drawn for all rows at once
+    counts = rng.poisson(4, size=len(contacts))
+    n = int(counts.sum())
+    contact_ids = np.repeat([c[0] for c in contacts], counts)
+    customer_ids = np.repeat([c[1] for c in contacts], counts)
+
+    minutes = (rng.integers(0, 365, size=n) * 1440
+               + rng.integers(8, 18, size=n) * 60 + rng.integers(0, 59, size=n))
+    int_dates = (np.datetime64('2024-01-01T00:00', 'm') + minutes.astype('timedelta64[m]'))
+    durations = np.where(rng.random(n) > 0.3,
+                         rng.lognormal(5, 0.8, size=n).astype(int), None)
+
+    records = list(zip(
+        contact_ids.tolist(), customer_ids.tolist(),
+        np.datetime_as_string(int_dates, unit='s').tolist(),
+        channels[np.searchsorted(chan_cdf, rng.random(n), side='right')].tolist(),
+        categories[np.searchsorted(cat_cdf, rng.random(n), side='right')].tolist(),
+        subjects[rng.integers(0, TEXT_POOL_SIZE, size=n)].tolist(),
+        (rng.random(n) > 0.15).tolist(),
+        agents[rng.integers(0, len(agents), size=n)].tolist(),
+        durations.tolist(),
+        np.round(rng.uniform(-0.5, 1.0, size=n), 2).tolist(),
+    ))
 
     cols = ['contact_id', 'customer_id', 'interaction_date', 'channel', 'category',
             'subject', 'resolved', 'handled_by', 'duration_seconds', 'sentiment_score']
-
-    # Batch insert
-    for i in range(0, len(records), 50000):
-        bulk_insert('crm.interactions', records[i:i+50000], cols)
+    # Rebuilding the indexes once is cheaper than maintaining them per row
+    with engine.begin() as conn, indexes_dropped('crm.interactions', conn):
+        bulk_insert('crm.interactions', records, cols, conn=conn)
 
     print(f"  ✓ CRM Interactions: {len(records):,} generated")
 
@@ -111,33 +144,51 @@ def generate_complaints():
     n_complaints = int(len(customer_ids) * COMPLAINT_RATIO)
     complainants = rng.choice(customer_ids, size=n_complaints, replace=True)
 
-    categories = ['charges_fees', 'service_quality', 'product_mis_sell', 'fraud',
-                  'payment_issue', 'lending_decision', 'other']
-    cat_weights = np.array([0.25, 0.20, 0.10, 0.10, 0.15, 0.10, 0.10])
-
-    records = []
-    for cid in complainants:
-        comp_date = date(2024, 1, 1) + timedelta(days=int(rng.integers(0, 365)))
-        status = rng.choice(['open', 'investigating', 'resolved', 'closed', 'referred_to_fos'],
-                             p=[0.10, 0.15, 0.40, 0.30, 0.05])
-        resolved = status in ('resolved', 'closed', 'referred_to_fos')
-
-        records.append({
-            'customer_id': int(cid),
-            'complaint_date': comp_date.isoformat(),
-            'category': rng.choice(categories, p=cat_weights),
-            'severity': rng.choice(['low', 'medium', 'high', 'critical'], p=[0.30, 0.40, 0.25, 0.05]),
-            'description': fake.paragraph(nb_sentences=2),
-            'root_cause': rng.choice(['process_failure', 'system_error', 'staff_error', 'policy_gap', None]),
-            'status': status,
-            'resolution_date': (comp_date + timedelta(days=int(rng.integers(1, 60)))).isoformat() if resolved else None,
-            'resolution_notes': fake.sentence() if resolved else None,
-            'compensation_amount': round(float(rng.lognormal(3, 1)), 2) if resolved and rng.random() > 0.6 else 0,
-            'fos_referral': status == 'referred_to_fos',
-            'assigned_to': f'COMP-{rng.integers(1, 15):03d}',
-        })
-
-    cols = list(records[0].keys())
+    # Weighted columns are sampled by searching precomputed CDFs with uniform draws
+    categories = np.array(['charges_fees', 'service_quality', 'product_mis_sell', 'fraud',
+                           'payment_issue', 'lending_decision', 'other'])
+    cat_cdf = np.cumsum([0.25, 0.20, 0.10, 0.10, 0.15, 0.10, 0.10])
+    cat_cdf /= cat_cdf[-1]
+    severities = np.array(['low', 'medium', 'high', 'critical'])
+    severity_cdf = np.cumsum([0.30, 0.40, 0.25, 0.05])
+    severity_cdf /= severity_cdf[-1]
+    statuses = np.array(['open', 'investigating', 'resolved', 'closed', 'referred_to_fos'])
+    status_cdf = np.cumsum([0.10, 0.15, 0.40, 0.30, 0.05])
+    status_cdf /= status_cdf[-1]
+
+    # Free text is sampled from Faker pools; every other column is one draw
+    n = n_complaints
+    sentences, paragraphs = _text_pools()
+    assignees = np.array([f'COMP-{i:03d}' for i in range(1, 15)])
+
+    # Every reachable day is formatted once; rows index into the shared strings
+    day_strs = np.datetime_as_string(np.datetime64('2024-01-01') + np.arange(365 + 60),
+                                     unit='D').astype(object)
+    comp_days = rng.integers(0, 365, size=n)
+    status = statuses[np.searchsorted(status_cdf, rng.random(n), side='right')]
+    resolved = np.isin(status, ['resolved', 'closed', 'referred_to_fos'])
+    resolution_days = comp_days + rng.integers(1, 60, size=n)
+    compensation = np.where(resolved & (rng.random(n) > 0.6),
+                            np.round(rng.lognormal(3, 1, size=n), 2), 0)
+
+    records = list(zip(
+        complainants.tolist(),
+        day_strs[comp_days].tolist(),
+        categories[np.searchsorted(cat_cdf, rng.random(n), side='right')].tolist(),
+        severities[np.searchsorted(severity_cdf, rng.random(n), side='right')].tolist(),
+        paragraphs[rng.integers(0, TEXT_POOL_SIZE, size=n)].tolist(),
+        rng.choice(['process_failure', 'system_error', 'staff_error', 'policy_gap', None], size=n).tolist(),
+        status.tolist(),
+        np.where(resolved, day_strs[resolution_days], None).tolist(),
+        np.where(resolved, sentences[rng.integers(0, TEXT_POOL_SIZE, size=n)], None).tolist(),
+        compensation.tolist(),
+        (status == 'referred_to_fos').tolist(),
+        assignees[rng.integers(0, len(assignees), size=n)].tolist(),
+    ))
+
+    cols = ['customer_id', 'complaint_date', 'category', 'severity', 'description',
+            'root_cause', 'status', 'resolution_date', 'resolution_notes',
+            'compensation_amount', 'fos_referral', 'assigned_to']
     bulk_insert('crm.complaints', records, cols)
     print(f"  ✓ Complaints: {len(records)} generated")
 
@@ -150,25 +201,33 @@ def generate_marketing_consents():
     consent_types = ['email_marketing', 'sms_marketing', 'phone_marketing',
                      'post_marketing', 'third_party_sharing', 'profiling', 'analytics']
 
-    records = []
-    for cid in tqdm(customer_ids, desc="  Consents", leave=False):
-        for ct in consent_types:
-            consented = bool(rng.random() > 0.35)
-            consent_date = date(2018, 5, 25) + timedelta(days=int(rng.integers(0, 2400)))  # Post-GDPR
-
-            records.append({
-                'customer_id': int(cid),
-                'consent_type': ct,
-                'is_consented': consented,
-                'consent_date': f'{consent_date.isoformat()} 12:00:00',
-                'withdrawal_date': (consent_date + timedelta(days=int(rng.integers(30, 730)))).isoformat() + ' 12:00:00' if not consented and rng.random() > 0.5 else None,
-                'consent_source': rng.choice(['onboarding', 'online_update', 'branch', 'campaign_response']),
-                'lawful_basis': 'consent' if consented else rng.choice(['consent', 'legitimate_interest']),
-            })
-
-    cols = list(records[0].keys())
-    for i in range(0, len(records), 50000):
-        bulk_insert('crm.marketing_consents', records[i:i+50000], cols)
+    # One row per (customer, consent type), every column drawn in one call
+    n = len(customer_ids) * len(consent_types)
+    consented = rng.random(n) > 0.35
+    # Post-GDPR; timestamps for every reachable day are formatted once and indexed
+    day_strs = np.char.add(
+        np.datetime_as_string(np.datetime64('2018-05-25') + np.arange(2400 + 730), unit='D'),
+        ' 12:00:00').astype(object)
+    consent_days = rng.integers(0, 2400, size=n)
+    withdrawn = ~consented & (rng.random(n) > 0.5)
+    withdrawal_days = consent_days + rng.integers(30, 730, size=n)
+    sources = rng.choice(['onboarding', 'online_update', 'branch', 'campaign_response'], size=n)
+    bases = np.where(consented, 'consent',
+                     rng.choice(['consent', 'legitimate_interest'], size=n))
+
+    records = list(zip(
+        np.repeat(customer_ids, len(consent_types)).tolist(),
+        np.tile(consent_types, len(customer_ids)).tolist(),
+        consented.tolist(),
+        day_strs[consent_days].tolist(),
+        np.where(withdrawn, day_strs[withdrawal_days], None).tolist(),
+        sources.tolist(),
+        bases.tolist(),
+    ))
+
+    cols = ['customer_id', 'consent_type', 'is_consented', 'consent_date', 'withdrawal_date',
+            'consent_source', 'lawful_basis']
+    bulk_insert('crm.marketing_consents', records, cols)
     print(f"  ✓ Marketing Consents: {len(records):,} generated")
 
 
@@ -197,17 +256,13 @@ def generate_segments():
     records = []
     for cid, seg in customers:
         if seg:
-            records.append({
-                'customer_id': cid,
-                'segment_code': seg,
-                'segment_name': segment_names.get(seg, seg),
-                'assigned_date': '2024-01-15',
-                'score': round(float(rng.uniform(0, 100)), 2),
-                'is_current': True,
-                'model_version': 'SEG_V2.1',
-            })
-
-    cols = list(records[0].keys())
+            records.append((
+                cid, seg, segment_names.get(seg, seg), '2024-01-15',
+                round(float(rng.uniform(0, 100)), 2), True, 'SEG_V2.1',
+            ))
+
+    cols = ['customer_id', 'segment_code', 'segment_name', 'assigned_date', 'score',
+            'is_current', 'model_version']
     bulk_insert('crm.segments', records, cols)
     print(f"  ✓ Segments: {len(records)} generated")
 
@@ -215,10 +270,10 @@ def generate_segments():
 def run():
     print("\n📞 Generating CRM data...")
     generate_contacts()
-    generate_interactions()
-    generate_complaints()
-    generate_marketing_consents()
-    generate_segments()
+    # Independent of each other once contacts exist, so the large COPY loads
+    # into interactions, consents and complaints overlap in separate workers
+    run_parallel(generate_interactions, generate_marketing_consents,
+                 generate_complaints, generate_segments)
     print("✅ CRM data complete\n")
 
 
@@ -4,13 +4,15 @@ Generate customers and addresses for Meridian Community Bank.
 """
 import numpy as np
 from datetime import date, timedelta
+from itertools import repeat
 from faker import Faker
 from tqdm import tqdm
+from sqlalchemy import text
 from generators.config import (
     SEED, CUSTOMER_COUNT, PERSONAL_RATIO, CUSTOMER_SEGMENTS,
-    MISSING_POSTCODE_COUNT, AML_FLAG_RATIO
+    MISSING_POSTCODE_COUNT, AML_FLAG_RATIO, PROGRESS_OPTS
 )
-from generators.utils.relationships import bulk_insert, registry
+from generators.utils.relationships import bulk_insert, registry, get_engine
 from generators.utils.faker_extensions import (
     generate_ni_number, generate_uk_postcode, generate_uk_phone
 )
@@ -18,6 +20,15 @@ from generators.utils.faker_extensions import (
 fake = Faker('en_GB')
 Faker.seed(SEED)
 
+# Column order of the customer tuples built below
+CUSTOMER_COLUMNS = [
+    'customer_ref', 'type', 'title', 'first_name', 'last_name', 'full_name',
+    'date_of_birth', 'gender', 'nationality', 'ni_number', 'email', 'phone_mobile',
+    'phone_home', 'company_name', 'company_reg_number', 'sic_code', 'kyc_status',
+    'kyc_verified_date', 'risk_rating', 'customer_segment', 'is_active', 'onboarded_date',
+    'closed_date'
+]
+
 
 def generate_customers():
     """Generate customer master records."""
@@ -31,7 +42,9 @@ def generate_customers():
 
     # Age distribution: UK-realistic
     # 18-25: 15%, 26-35: 25%, 36-50: 30%, 51-65: 20%, 66+: 10%
-    age_weights = [0.15, 0.25, 0.30, 0.20, 0.10]
+    # Weighted draws search CDFs built once instead of calling rng.choice(p=...) per row
+    age_cdf = np.cumsum([0.15, 0.25, 0.30, 0.20, 0.10])
+    age_cdf /= age_cdf[-1]
     age_ranges = [(18, 25), (26, 35), (36, 50), (51, 65), (66, 85)]
 
     # KYC status distribution
@@ -39,18 +52,26 @@ def generate_customers():
                     'verified', 'verified', 'enhanced_due_diligence', 'pending', 'expired']
 
     # Risk rating (most are standard)
-    risk_weights = np.array([0.25, 0.55, 0.12, 0.05, 0.02, 0.01])
+    risk_cdf = np.cumsum([0.25, 0.55, 0.12, 0.05, 0.02, 0.01])
+    risk_cdf /= risk_cdf[-1]
     risk_ratings = ['low', 'standard', 'medium', 'high', 'pep', 'sanctioned']
 
     # Segments for personal
     personal_segments = ['mass_market', 'mass_affluent', 'high_net_worth',
                         'young_professional', 'student', 'retired']
-    personal_seg_weights = np.array([0.45, 0.25, 0.05, 0.12, 0.05, 0.08])
+    personal_seg_cdf = np.cumsum([0.45, 0.25, 0.05, 0.12, 0.05, 0.08])
+    personal_seg_cdf /= personal_seg_cdf[-1]
+
+    # Names and domains are sampled from pools built once; repeats are realistic at this scale
+    male_names = [fake.first_name_male() for _ in range(4000)]
+    female_names = [fake.first_name_female() for _ in range(4000)]
+    last_names = [fake.last_name() for _ in range(8000)]
+    email_domains = [fake.free_email_domain() for _ in range(20)]
 
     print(f"  Generating {n_personal} personal customers...")
-    for i in tqdm(range(n_personal), desc="  Personal customers", leave=False):
+    for i in tqdm(range(n_personal), desc="  Personal customers", leave=False, **PROGRESS_OPTS):
         # Age
-        age_bracket = rng.choice(len(age_ranges), p=age_weights)
+        age_bracket = np.searchsorted(age_cdf, rng.random(), side='right')
         age = rng.integers(age_ranges[age_bracket][0], age_ranges[age_bracket][1] + 1)
         dob = date(2024, 7, 1) - timedelta(days=int(age * 365 + rng.integers(0, 365)))
 
@@ -61,16 +82,16 @@ def generate_customers():
 
         gender = rng.choice(['male', 'female'])
         if gender == 'male':
-            first = fake.first_name_male()
+            first = male_names[rng.integers(len(male_names))]
             title = rng.choice(['Mr', 'Mr', 'Mr', 'Dr'])
         else:
-            first = fake.first_name_female()
+            first = female_names[rng.integers(len(female_names))]
             title = rng.choice(['Ms', 'Mrs', 'Miss', 'Dr'])
-        last = fake.last_name()
+        last = last_names[rng.integers(len(last_names))]
 
-        risk = rng.choice(risk_ratings, p=risk_weights)
+        risk = risk_ratings[np.searchsorted(risk_cdf, rng.random(), side='right')]
         kyc = rng.choice(kyc_statuses)
-        segment = rng.choice(personal_segments, p=personal_seg_weights)
+        segment = personal_segments[np.searchsorted(personal_seg_cdf, rng.random(), side='right')]
 
         # ~8% of customers are inactive/closed
         is_active = rng.random() > 0.08
@@ -78,95 +99,77 @@ def generate_customers():
         if not is_active:
             closed_date = (onboarded + timedelta(days=int(rng.integers(180, 3000)))).isoformat()
 
-        records.append({
-            'customer_ref': f'MCB-{10000001 + i}',
-            'type': 'personal',
-            'title': title,
-            'first_name': first,
-            'last_name': last,
-            'full_name': f'{title} {first} {last}',
-            'date_of_birth': dob.isoformat(),
-            'gender': gender,
-            'nationality': 'British' if rng.random() > 0.15 else rng.choice([
+        records.append((
+            f'MCB-{10000001 + i}', 'personal', title, first, last, f'{title} {first} {last}',
+            dob.isoformat(), gender,
+            'British' if rng.random() > 0.15 else rng.choice([
                 'Irish', 'Polish', 'Indian', 'Pakistani', 'Nigerian', 'Romanian',
                 'Italian', 'Portuguese', 'French', 'German'
             ]),
-            'ni_number': generate_ni_number(rng),
-            'email': f'{first.lower()}.{last.lower()}{rng.integers(1,999)}@{fake.free_email_domain()}',
-            'phone_mobile': generate_uk_phone(),
-            'phone_home': generate_uk_phone() if rng.random() > 0.6 else None,
-            'company_name': None,
-            'company_reg_number': None,
-            'sic_code': None,
-            'kyc_status': kyc,
-            'kyc_verified_date': (onboarded + timedelta(days=int(rng.integers(1, 30)))).isoformat() if kyc == 'verified' else None,
-            'risk_rating': risk,
-            'customer_segment': segment,
-            'is_active': is_active,
-            'onboarded_date': onboarded.isoformat(),
-            'closed_date': closed_date,
-        })
+            generate_ni_number(rng),
+            f'{first.lower()}.{last.lower()}{rng.integers(1,999)}@{email_domains[rng.integers(len(email_domains))]}',
+            generate_uk_phone(),
+            generate_uk_phone() if rng.random() > 0.6 else None,
+            None, None, None,  # company fields
+            kyc,
+            (onboarded + timedelta(days=int(rng.integers(1, 30)))).isoformat() if kyc == 'verified' else None,
+            risk, segment, is_active, onboarded.isoformat(), closed_date,
+        ))
 
     # Business segments
     business_segments = ['small_business', 'growing_business']
-    business_seg_weights = np.array([0.70, 0.30])
+    business_seg_cdf = np.cumsum([0.70, 0.30])
+    business_seg_cdf /= business_seg_cdf[-1]
+    business_risk_cdf = np.cumsum([0.20, 0.50, 0.20, 0.10])
+    business_risk_cdf /= business_risk_cdf[-1]
     sic_codes = ['62020', '47110', '56101', '41201', '69201', '86210',
                  '96020', '55100', '49410', '01110', '74909', '82990']
 
+    companies = [fake.company() for _ in range(5000)]
+
     print(f"  Generating {n_business} business customers...")
-    for i in tqdm(range(n_business), desc="  Business customers", leave=False):
-        company = fake.company()
+    for i in tqdm(range(n_business), desc="  Business customers", leave=False, **PROGRESS_OPTS):
+        company = companies[rng.integers(len(companies))]
         onboarded = date(2015, 1, 1) + timedelta(days=int(rng.integers(0, 3650)))
         if onboarded > date(2024, 12, 31):
             onboarded = date(2024, 12, 31)
 
-        risk = rng.choice(risk_ratings[:4], p=np.array([0.20, 0.50, 0.20, 0.10]))
+        risk = risk_ratings[np.searchsorted(business_risk_cdf, rng.random(), side='right')]
         is_active = rng.random() > 0.10
 
-        records.append({
-            'customer_ref': f'MCB-{10000001 + n_personal + i}',
-            'type': 'business',
-            'title': None,
-            'first_name': None,
-            'last_name': None,
-            'full_name': company,
-            'date_of_birth': None,
-            'gender': None,
-            'nationality': None,
-            'ni_number': None,
-            'email': f'info@{company.lower().replace(" ", "").replace(",","").replace("&","")[:20]}.co.uk',
-            'phone_mobile': generate_uk_phone(),
-            'phone_home': generate_uk_phone() if rng.random() > 0.4 else None,
-            'company_name': company,
-            'company_reg_number': f'{rng.integers(1000000, 99999999):08d}',
-            'sic_code': rng.choice(sic_codes),
-            'kyc_status': rng.choice(['verified', 'verified', 'verified', 'enhanced_due_diligence']),
-            'kyc_verified_date': (onboarded + timedelta(days=int(rng.integers(1, 30)))).isoformat(),
-            'risk_rating': risk,
-            'customer_segment': rng.choice(business_segments, p=business_seg_weights),
-            'is_active': is_active,
-            'onboarded_date': onboarded.isoformat(),
-            'closed_date': None if is_active else (onboarded + timedelta(days=int(rng.integers(180, 2000)))).isoformat(),
-        })
-
-    cols = list(records[0].keys())
+        records.append((
+            f'MCB-{10000001 + n_personal + i}', 'business', None, None, None, company,
+            None, None, None, None,  # no DOB, gender, nationality or NI number
+            f'info@{company.lower().replace(" ", "").replace(",","").replace("&","")[:20]}.co.uk',
+            generate_uk_phone(),
+            generate_uk_phone() if rng.random() > 0.4 else None,
+            company,
+            f'{rng.integers(1000000, 99999999):08d}',
+            rng.choice(sic_codes),
+            rng.choice(['verified', 'verified', 'verified', 'enhanced_due_diligence']),
+            (onboarded + timedelta(days=int(rng.integers(1, 30)))).isoformat(),
+            risk,
+            business_segments[np.searchsorted(business_seg_cdf, rng.random(), side='right')],
+            is_active,
+            onboarded.isoformat(),
+            None if is_active else (onboarded + timedelta(days=int(rng.integers(180, 2000)))).isoformat(),
+        ))
+
     print(f"  Inserting {len(records)} customers...")
-    bulk_insert('core_banking.customers', records, cols)
+    bulk_insert('core_banking.customers', records, CUSTOMER_COLUMNS)
 
     # Retrieve IDs
-    from sqlalchemy import text
-    engine = registry._store  # hacky but works
-    from generators.utils.relationships import get_engine
-    eng = get_engine()
-    with eng.connect() as conn:
+    with get_engine().connect() as conn:
         rows = conn.execute(text(
             "SELECT customer_id, type, is_active FROM core_banking.customers ORDER BY customer_id"
         )).fetchall()
 
-    all_ids = [r[0] for r in rows]
-    personal_ids = [r[0] for r in rows if r[1] == 'personal']
-    business_ids = [r[0] for r in rows if r[1] == 'business']
-    active_ids = [r[0] for r in rows if r[2]]
+    all_ids = np.fromiter((r[0] for r in rows), dtype=np.int64, count=len(rows))
+    types = np.array([r[1] for r in rows])
+    is_active = np.fromiter((r[2] for r in rows), dtype=bool, count=len(rows))
+    personal_ids = all_ids[types == 'personal']
+    business_ids = all_ids[types == 'business']
+    active_ids = all_ids[is_active]
 
     registry.register('customer_ids', all_ids)
     registry.register('personal_customer_ids', personal_ids)
@@ -182,39 +185,44 @@ def generate_addresses():
     rng = np.random.default_rng(SEED + 1)
     customer_ids = registry.get_ids('customer_ids')
 
-    records = []
+    # Address parts are sampled from Faker pools; optional fields use masks
+    streets = np.array([fake.street_address() for _ in range(5000)])
+    secondaries = np.array([fake.secondary_address() for _ in range(1000)])
+    cities = np.array([fake.city() for _ in range(2000)])
+    counties = np.array([fake.county() for _ in range(500)])
+    postcodes = np.array([fake.postcode() for _ in range(5000)])
+
+    def pick(pool, size):
+        return pool[rng.integers(0, len(pool), size=size)]
+
+    n = len(customer_ids)
     # Track which customers get missing postcodes (for DQ testing)
-    missing_postcode_customers = set(rng.choice(customer_ids, size=MISSING_POSTCODE_COUNT, replace=False))
-
-    print(f"  Generating addresses for {len(customer_ids)} customers...")
-    for cid in tqdm(customer_ids, desc="  Addresses", leave=False):
-        # Primary address
-        addr = {
-            'customer_id': int(cid),
-            'address_type': 'home',
-            'line1': fake.street_address(),
-            'line2': fake.secondary_address() if rng.random() > 0.6 else None,
-            'line3': None,
-            'city': fake.city(),
-            'county': fake.county() if rng.random() > 0.3 else None,
-            'postcode': None if cid in missing_postcode_customers else fake.postcode(),
-            'country': 'United Kingdom',
-            'is_primary': True,
-            'valid_from': '2015-01-01',
-            'valid_to': None,
-        }
-        records.append(addr)
-
-        # ~30% have a correspondence address too
-        if rng.random() > 0.7:
-            records.append({
-                **addr,
-                'address_type': 'correspondence',
-                'line1': fake.street_address(),
-                'city': fake.city(),
-                'postcode': fake.postcode(),
-                'is_primary': False,
-            })
+    missing_postcode = np.isin(customer_ids,
+                               rng.choice(customer_ids, size=MISSING_POSTCODE_COUNT, replace=False))
+
+    print(f"  Generating addresses for {n} customers...")
+    # Primary address
+    line1 = pick(streets, n)
+    line2 = np.where(rng.random(n) > 0.6, pick(secondaries, n), None)
+    city = pick(cities, n)
+    county = np.where(rng.random(n) > 0.3, pick(counties, n), None)
+    postcode = np.where(missing_postcode, None, pick(postcodes, n))
+    home = zip(customer_ids.tolist(), repeat('home'), line1.tolist(), line2.tolist(), repeat(None),
+               city.tolist(), county.tolist(), postcode.tolist(), repeat('United Kingdom'),
+               repeat(True), repeat('2015-01-01'), repeat(None))
+
+    # ~30% have a correspondence address too, sharing line2/county with the home one
+    has = rng.random(n) > 0.7
+    k = int(has.sum())
+    corr = zip(customer_ids[has].tolist(), repeat('correspondence'), pick(streets, k).tolist(),
+               line2[has].tolist(), repeat(None), pick(cities, k).tolist(), county[has].tolist(),
+               pick(postcodes, k).tolist(), repeat('United Kingdom'), repeat(False),
+               repeat('2015-01-01'), repeat(None))
+
+    # Each correspondence row follows its customer's home row
+    rows = list(home) + list(corr)
+    order = np.argsort(np.concatenate([np.arange(n) * 2, np.flatnonzero(has) * 2 + 1]))
+    records = [rows[i] for i in order]
 
     cols = ['customer_id', 'address_type', 'line1', 'line2', 'line3',
             'city', 'county', 'postcode', 'country', 'is_primary', 'valid_from', 'valid_to']
@@ -3,11 +3,17 @@ Generate General Ledger entries derived from transactions and banking operations
 Includes an intentional GL imbalance for DQ testing.
 """
 import numpy as np
-from datetime import date, timedelta
-from tqdm import tqdm
+from itertools import repeat
 from sqlalchemy import text
 from generators.config import SEED, GL_IMBALANCE_BATCH
-from generators.utils.relationships import bulk_insert, registry, get_engine
+from generators.utils.relationships import (
+    bulk_insert, registry, get_engine, indexes_dropped
+)
+
+# Column order of the GL entry tuples built below
+GL_COLUMNS = ['journal_id', 'batch_id', 'entry_date', 'posting_date', 'account_code',
+              'cost_centre_code', 'debit_amount', 'credit_amount', 'currency',
+              'description', 'source_system', 'source_reference', 'is_manual', 'posted_by']
 
 
 def generate_gl_entries():
@@ -42,172 +48,105 @@ def generate_gl_entries():
         'atm_withdrawal': ('2110', '1130'),  # Deposit ↔ ATM cash
     }
 
+    # Journal legs per transaction type, looked up by drawn index. Object
+    # arrays, so every row shares one str per distinct value instead of a copy
+    txn_types = list(txn_gl_map)
+    debit_codes = np.array([txn_gl_map[t][0] for t in txn_types], dtype=object)
+    credit_codes = np.array([txn_gl_map[t][1] for t in txn_types], dtype=object)
+    descriptions = np.array([f'{t.replace("_"," ").title()} posting' for t in txn_types],
+                            dtype=object)
+
     # Generate daily GL entries for 6 months
-    records = []
-    journal_counter = 0
-    start_date = date(2024, 7, 1)
-    end_date = date(2024, 12, 31)
+    start_date = np.datetime64('2024-07-01')
+    end_date = np.datetime64('2024-12-31')
 
-    n_days = (end_date - start_date).days + 1
+    n_days = int((end_date - start_date) // np.timedelta64(1, 'D')) + 1
     print(f"  Generating GL entries for {n_days} days...")
 
-    for day_offset in tqdm(range(n_days), desc="  GL entries", leave=False):
-        current_date = start_date + timedelta(days=day_offset)
-        date_str = current_date.isoformat()
-
-        # ~150-250 journals per day (simplified from real txn volume)
-        n_journals = rng.integers(150, 250)
-        batch_id = f'BATCH-{current_date.strftime("%Y%m%d")}'
-
-        for j in range(n_journals):
-            journal_counter += 1
-            journal_id = f'JNL-{journal_counter:08d}'
-            cc = rng.choice(cc_codes)
-
-            # Pick a transaction type and get GL codes
-            txn_type = rng.choice(list(txn_gl_map.keys()))
-            debit_code, credit_code = txn_gl_map[txn_type]
-
-            amount = round(float(rng.lognormal(5.0, 1.2)), 2)
-            amount = min(amount, 100000)
-
-            source_ref = f'TXN-{rng.integers(100000, 999999)}'
-
-            # Debit entry
-            records.append({
-                'journal_id': journal_id,
-                'batch_id': batch_id,
-                'entry_date': date_str,
-                'posting_date': date_str,
-                'account_code': debit_code,
-                'cost_centre_code': cc,
-                'debit_amount': amount,
-                'credit_amount': 0,
-                'currency': 'GBP',
-                'description': f'{txn_type.replace("_"," ").title()} posting',
-                'source_system': 'core_banking',
-                'source_reference': source_ref,
-                'is_manual': False,
-                'posted_by': 'SYSTEM',
-            })
-
-            # Credit entry
-            records.append({
-                'journal_id': journal_id,
-                'batch_id': batch_id,
-                'entry_date': date_str,
-                'posting_date': date_str,
-                'account_code': credit_code,
-                'cost_centre_code': cc,
-                'debit_amount': 0,
-                'credit_amount': amount,
-                'currency': 'GBP',
-                'description': f'{txn_type.replace("_"," ").title()} posting',
-                'source_system': 'core_banking',
-                'source_reference': source_ref,
-                'is_manual': False,
-                'posted_by': 'SYSTEM',
-            })
-
-        # Insert in chunks
-        if len(records) >= 10000:
-            _insert_gl_batch(records)
-            records = []
+    # ~150-250 journals per day (simplified from real txn volume); every
+    # journal of every day is drawn in one pass
+    n_per_day = rng.integers(150, 250, size=n_days)
+    n = int(n_per_day.sum())
+    days = np.datetime_as_string(start_date + np.arange(n_days), unit='D')
+    entry_dates = np.repeat(days.astype(object), n_per_day)
+    batch_ids = np.repeat(np.char.add('BATCH-', np.char.replace(days, '-', '')).astype(object),
+                          n_per_day)
+    journal_ids = [f'JNL-{i:08d}' for i in range(1, n + 1)]
+    cc = np.array(cc_codes, dtype=object)[rng.integers(0, len(cc_codes), size=n)]
+    txn = rng.integers(0, len(txn_types), size=n)
+    # Round and clamp in place: no temporaries beyond the drawn array
+    amount = rng.lognormal(5.0, 1.2, size=n)
+    np.round(amount, 2, out=amount)
+    np.minimum(amount, 100000, out=amount)
+    source_refs = [f'TXN-{r}' for r in rng.integers(100000, 999999, size=n).tolist()]
+
+    # Each journal is a debit row followed by its credit row
+    zero = np.zeros(n)
+    dates = np.repeat(entry_dates, 2).tolist()
+    records = list(zip(
+        np.repeat(journal_ids, 2).tolist(), np.repeat(batch_ids, 2).tolist(), dates, dates,
+        np.column_stack([debit_codes[txn], credit_codes[txn]]).ravel().tolist(),
+        np.repeat(cc, 2).tolist(),
+        np.column_stack([amount, zero]).ravel().tolist(),
+        np.column_stack([zero, amount]).ravel().tolist(),
+        repeat('GBP'), np.repeat(descriptions[txn], 2).tolist(), repeat('core_banking'),
+        np.repeat(source_refs, 2).tolist(), repeat(False), repeat('SYSTEM'),
+    ))
 
     # ── Intentional GL imbalance ──────────────────────────
     # Add an unbalanced journal entry for DQ testing
-    journal_counter += 1
-    records.append({
-        'journal_id': f'JNL-{journal_counter:08d}',
-        'batch_id': GL_IMBALANCE_BATCH,
-        'entry_date': '2024-11-15',
-        'posting_date': '2024-11-15',
-        'account_code': '4210',
-        'cost_centre_code': 'CC-FIN',
-        'debit_amount': 15000.00,
-        'credit_amount': 0,
-        'currency': 'GBP',
-        'description': 'IMBALANCED ENTRY — Fee adjustment (DQ test)',
-        'source_system': 'manual',
-        'source_reference': 'MANUAL-ERR-001',
-        'is_manual': True,
-        'posted_by': 'FIN-003',
-    })
-    journal_counter += 1
-    records.append({
-        'journal_id': f'JNL-{journal_counter:08d}',
-        'batch_id': GL_IMBALANCE_BATCH,
-        'entry_date': '2024-11-15',
-        'posting_date': '2024-11-15',
-        'account_code': '2110',
-        'cost_centre_code': 'CC-FIN',
-        'debit_amount': 0,
-        'credit_amount': 14500.00,  # £500 imbalance!
-        'currency': 'GBP',
-        'description': 'IMBALANCED ENTRY — Fee adjustment (DQ test)',
-        'source_system': 'manual',
-        'source_reference': 'MANUAL-ERR-001',
-        'is_manual': True,
-        'posted_by': 'FIN-003',
-    })
-
-    if records:
-        _insert_gl_batch(records)
-
-    with engine.connect() as conn:
-        count = conn.execute(text("SELECT COUNT(*) FROM gl.gl_entries")).scalar()
-    print(f"  ✓ GL Entries: {count:,} inserted (includes 1 imbalanced journal: {GL_IMBALANCE_BATCH})")
-
-
-def _insert_gl_batch(records):
-    """Insert GL entry batch."""
-    cols = ['journal_id', 'batch_id', 'entry_date', 'posting_date', 'account_code',
-            'cost_centre_code', 'debit_amount', 'credit_amount', 'currency',
-            'description', 'source_system', 'source_reference', 'is_manual', 'posted_by']
-    bulk_insert('gl.gl_entries', records, cols)
+    records.append((
+        f'JNL-{n + 1:08d}', GL_IMBALANCE_BATCH, '2024-11-15', '2024-11-15',
+        '4210', 'CC-FIN', 15000.00, 0, 'GBP',
+        'IMBALANCED ENTRY — Fee adjustment (DQ test)', 'manual', 'MANUAL-ERR-001',
+        True, 'FIN-003',
+    ))
+    records.append((
+        f'JNL-{n + 2:08d}', GL_IMBALANCE_BATCH, '2024-11-15', '2024-11-15',
+        '2110', 'CC-FIN', 0, 14500.00,  # £500 imbalance!
+        'GBP', 'IMBALANCED ENTRY — Fee adjustment (DQ test)', 'manual', 'MANUAL-ERR-001',
+        True, 'FIN-003',
+    ))
+
+    # Rebuilding the indexes once is cheaper than maintaining them per row
+    with engine.begin() as conn, indexes_dropped('gl.gl_entries', conn):
+        _insert_gl_batch(records, conn)
+    print(f"  ✓ GL Entries: {len(records):,} inserted (includes 1 imbalanced journal: {GL_IMBALANCE_BATCH})")
+
+
+def _insert_gl_batch(records, conn=None):
+    """Insert GL entry batch (tuples in GL_COLUMNS order)."""
+    bulk_insert('gl.gl_entries', records, GL_COLUMNS, conn=conn)
 
 
 def generate_gl_balances():
     """Generate period-end GL balance snapshots."""
-    rng = np.random.default_rng(SEED + 41)
     engine = get_engine()
 
-    # Get monthly summaries from GL entries
-    with engine.connect() as conn:
-        rows = conn.execute(text("""
-            SELECT account_code, cost_centre_code,
-                   DATE_TRUNC('month', entry_date) + INTERVAL '1 month' - INTERVAL '1 day' as period_end,
-                   SUM(debit_amount) as total_debits,
-                   SUM(credit_amount) as total_credits
-            FROM gl.gl_entries
-            GROUP BY account_code, cost_centre_code, DATE_TRUNC('month', entry_date)
+    # Monthly totals per account/cost centre with a running closing balance,
+    # computed and inserted server-side
+    with engine.begin() as conn:
+        result = conn.execute(text("""
+            INSERT INTO gl.gl_balances (period_end_date, account_code, cost_centre_code,
+                                        opening_balance, period_debits, period_credits,
+                                        closing_balance, currency)
+            SELECT period_end, account_code, cost_centre_code,
+                   closing - (debits - credits), debits, credits, closing, 'GBP'
+            FROM (
+                SELECT (DATE_TRUNC('month', entry_date) + INTERVAL '1 month' - INTERVAL '1 day')::date as period_end,
+                       account_code, cost_centre_code,
+                       SUM(debit_amount) as debits,
+                       SUM(credit_amount) as credits,
+                       SUM(SUM(debit_amount) - SUM(credit_amount)) OVER (
+                           PARTITION BY account_code, cost_centre_code
+                           ORDER BY DATE_TRUNC('month', entry_date)
+                       ) as closing
+                FROM gl.gl_entries
+                GROUP BY account_code, cost_centre_code, DATE_TRUNC('month', entry_date)
+            ) monthly
             ORDER BY period_end, account_code
-        """)).fetchall()
-
-    records = []
-    running_balances = {}  # (account_code, cc) -> balance
-
-    for acct, cc, period_end, debits, credits in rows:
-        key = (acct, cc)
-        opening = running_balances.get(key, 0)
-        closing = opening + float(debits) - float(credits)
-        running_balances[key] = closing
-
-        records.append({
-            'period_end_date': period_end.date().isoformat() if hasattr(period_end, 'date') else str(period_end)[:10],
-            'account_code': acct,
-            'cost_centre_code': cc,
-            'opening_balance': round(opening, 2),
-            'period_debits': round(float(debits), 2),
-            'period_credits': round(float(credits), 2),
-            'closing_balance': round(closing, 2),
-            'currency': 'GBP',
-        })
-
-    if records:
-        cols = list(records[0].keys())
-        bulk_insert('gl.gl_balances', records, cols)
-    print(f"  ✓ GL Balances: {len(records)} period-end snapshots")
+        """))
+    print(f"  ✓ GL Balances: {result.rowcount} period-end snapshots")
 
 
 def run():
@@ -1,71 +1,128 @@
 """
 Generate Payments data: standing orders, direct debits, payment instructions, receipts, failed payments.
 """
+from contextlib import contextmanager
 import numpy as np
-from datetime import date, timedelta
-from tqdm import tqdm
+from numpy.random import Generator, SFC64
+from itertools import repeat
 from sqlalchemy import text
 from generators.config import SEED
-from generators.utils.relationships import bulk_insert, registry, get_engine
+from generators.utils.relationships import (
+    bulk_insert, registry, get_engine, indexes_dropped, run_parallel
+)
 from generators.utils.faker_extensions import (
-    generate_account_number, generate_sort_code, RETAIL_COUNTERPARTIES
+    generate_account_numbers, generate_sort_codes, RETAIL_COUNTERPARTIES
 )
 
+# Counterparty pool sampled by integer index; object array so rows share one str per value
+_COUNTERPARTIES = np.array(RETAIL_COUNTERPARTIES, dtype=object)
+
+# Column order of the tuples built below
+STANDING_ORDER_COLUMNS = [
+    'account_id', 'payee_name', 'payee_account', 'payee_sort_code', 'amount', 'currency',
+    'frequency', 'start_date', 'end_date', 'next_payment_date', 'reference', 'status'
+]
+DIRECT_DEBIT_COLUMNS = [
+    'account_id', 'originator_name', 'originator_id', 'reference', 'mandate_date',
+    'first_collection', 'last_collection', 'status'
+]
+PAYMENT_INSTRUCTION_COLUMNS = [
+    'account_id', 'scheme_id', 'instruction_date', 'amount', 'currency', 'beneficiary_name',
+    'beneficiary_account', 'beneficiary_sort_code', 'reference', 'payment_type', 'priority',
+    'status', 'settlement_date'
+]
+PAYMENT_RECEIPT_COLUMNS = [
+    'account_id', 'scheme_id', 'receipt_date', 'amount', 'currency', 'sender_name',
+    'sender_account', 'sender_sort_code', 'reference', 'status'
+]
+
+
+# ── Shared lookups ───────────────────────────────────────────
+# Each query runs once per process; results are kept in the registry so the
+# generators below (and any later step) reuse them
+def _active_current_account_ids():
+    """IDs of active personal and business current accounts."""
+    with get_engine().connect() as conn:
+        return [r[0] for r in conn.execute(text("""
+            SELECT a.account_id FROM core_banking.accounts a
+            JOIN core_banking.products p ON a.product_id = p.product_id
+            WHERE p.category IN ('current_account', 'business_current') AND a.status = 'active'
+        """)).fetchall()]
+
+
+def _status_active_account_ids():
+    """IDs of all accounts with status 'active'."""
+    with get_engine().connect() as conn:
+        return [r[0] for r in conn.execute(text(
+            "SELECT account_id FROM core_banking.accounts WHERE status = 'active'"
+        )).fetchall()]
+
+
+def _scheme_map():
+    """Payment scheme code -> scheme_id, wrapped like the reference-data entry."""
+    with get_engine().connect() as conn:
+        rows = conn.execute(text("SELECT scheme_id, scheme_code FROM payments.payment_schemes")).fetchall()
+    return [{code: sid for sid, code in rows}]
+
+
+# ── Shared transaction ───────────────────────────────────────
+@contextmanager
+def _transaction(conn=None):
+    """Yield the caller's connection, or a new transaction that commits on exit.
+
+    Payment data is regenerable, so new transactions skip the WAL flush wait.
+    """
+    if conn is not None:
+        yield conn
+        return
+    with get_engine().begin() as conn:
+        conn.execute(text("SET LOCAL synchronous_commit = off"))
+        yield conn
+
 
 def generate_standing_orders():
     """Generate standing orders for current account holders."""
     rng = np.random.default_rng(SEED + 70)
-    engine = get_engine()
-
-    with engine.connect() as conn:
-        accounts = conn.execute(text("""
-            SELECT a.account_id FROM core_banking.accounts a
-            JOIN core_banking.products p ON a.product_id = p.product_id
-            WHERE p.category IN ('current_account', 'business_current') AND a.status = 'active'
-        """)).fetchall()
-
-    account_ids = [r[0] for r in accounts]
-    records = []
-    payees = ['Landlord', 'Savings Transfer', 'Charity Donation', 'Gym Membership',
-              'Insurance Premium', 'Child Maintenance', 'Parent Support']
-
-    for aid in tqdm(account_ids, desc="  Standing orders", leave=False):
-        n = max(0, int(rng.poisson(1.5)))
-        for _ in range(n):
-            start = date(2023, 1, 1) + timedelta(days=int(rng.integers(0, 730)))
-            records.append({
-                'account_id': aid,
-                'payee_name': rng.choice(payees),
-                'payee_account': generate_account_number(rng),
-                'payee_sort_code': generate_sort_code(rng),
-                'amount': round(float(rng.choice([25, 50, 100, 150, 200, 300, 500, 750, 1000])), 2),
-                'currency': 'GBP',
-                'frequency': rng.choice(['monthly', 'weekly', 'quarterly'], p=[0.70, 0.15, 0.15]),
-                'start_date': start.isoformat(),
-                'end_date': None if rng.random() > 0.2 else (start + timedelta(days=int(rng.integers(180, 730)))).isoformat(),
-                'next_payment_date': '2025-01-15',
-                'reference': f'SO-{rng.integers(10000, 99999)}',
-                'status': rng.choice(['active', 'active', 'active', 'cancelled']),
-            })
-
-    cols = list(records[0].keys())
-    bulk_insert('core_banking.standing_orders', records, cols)
+    account_ids = registry.get_or_compute('active_current_account_ids',
+                                          _active_current_account_ids)
+    payees = np.array(['Landlord', 'Savings Transfer', 'Charity Donation', 'Gym Membership',
+                       'Insurance Premium', 'Child Maintenance', 'Parent Support'], dtype=object)
+    amounts = np.array([25, 50, 100, 150, 200, 300, 500, 750, 1000], dtype=float)
+    frequencies = np.array(['monthly', 'weekly', 'quarterly'], dtype=object)
+    statuses = np.array(['active', 'active', 'active', 'cancelled'], dtype=object)
+
+    # ~1.5 orders per account; every column is drawn once for all orders
+    counts = rng.poisson(1.5, size=len(account_ids))
+    n = int(counts.sum())
+    days = np.datetime_as_string(np.datetime64('2023-01-01') + np.arange(730 + 730), unit='D')
+    start_days = rng.integers(0, 730, size=n)
+    end_days = start_days + rng.integers(180, 730, size=n)
+
+    records = list(zip(
+        np.repeat(account_ids, counts).tolist(),
+        payees[rng.integers(0, len(payees), size=n)].tolist(),
+        generate_account_numbers(rng, n).tolist(),
+        generate_sort_codes(rng, n).tolist(),
+        amounts[rng.integers(0, len(amounts), size=n)].tolist(),
+        repeat('GBP'),
+        frequencies[rng.choice(len(frequencies), size=n, p=[0.70, 0.15, 0.15])].tolist(),
+        days[start_days].tolist(),
+        np.where(rng.random(n) > 0.2, None, days[end_days]).tolist(),
+        repeat('2025-01-15'),
+        np.char.add('SO-', rng.integers(10000, 99999, size=n).astype(str)).tolist(),
+        statuses[rng.integers(0, len(statuses), size=n)].tolist(),
+    ))
+
+    with _transaction() as conn:
+        bulk_insert('core_banking.standing_orders', records, STANDING_ORDER_COLUMNS, conn=conn)
     print(f"  ✓ Standing Orders: {len(records)} generated")
 
 
 def generate_direct_debits():
     """Generate direct debit mandates."""
     rng = np.random.default_rng(SEED + 71)
-    engine = get_engine()
-
-    with engine.connect() as conn:
-        accounts = conn.execute(text("""
-            SELECT a.account_id FROM core_banking.accounts a
-            JOIN core_banking.products p ON a.product_id = p.product_id
-            WHERE p.category IN ('current_account', 'business_current') AND a.status = 'active'
-        """)).fetchall()
-
-    account_ids = [r[0] for r in accounts]
+    account_ids = registry.get_or_compute('active_current_account_ids',
+                                          _active_current_account_ids)
     originators = [
         ('British Gas', 'SUN-001'), ('EDF Energy', 'SUN-002'), ('Thames Water', 'SUN-003'),
         ('Sky TV', 'SUN-004'), ('BT', 'SUN-005'), ('Council Tax', 'SUN-006'),
@@ -74,152 +131,194 @@ def generate_direct_debits():
         ('Aviva', 'SUN-012'), ('PureGym', 'SUN-013'),
     ]
 
-    records = []
-    for aid in tqdm(account_ids, desc="  Direct debits", leave=False):
-        n = max(0, int(rng.poisson(3)))
-        selected = rng.choice(len(originators), size=min(n, len(originators)), replace=False)
-        for idx in selected:
-            name, sun = originators[idx]
-            mandate = date(2020, 1, 1) + timedelta(days=int(rng.integers(0, 1800)))
-            records.append({
-                'account_id': aid,
-                'originator_name': name,
-                'originator_id': sun,
-                'reference': f'DD-{rng.integers(100000, 999999)}',
-                'mandate_date': mandate.isoformat(),
-                'first_collection': (mandate + timedelta(days=int(rng.integers(14, 45)))).isoformat(),
-                'last_collection': '2024-12-15',
-                'status': rng.choice(['active', 'active', 'active', 'cancelled', 'suspended'], p=[0.60, 0.20, 0.05, 0.10, 0.05]),
-            })
-
-    cols = list(records[0].keys())
-    bulk_insert('core_banking.direct_debits', records, cols)
+    # Each account picks up to 13 distinct originators: rank random keys per
+    # row and keep the first `count` columns, all accounts in one pass
+    n_orig = len(originators)
+    counts = np.minimum(rng.poisson(3, size=len(account_ids)), n_orig)
+    picks = np.argsort(rng.random((len(account_ids), n_orig)), axis=1)
+    picked = picks[np.arange(n_orig) < counts[:, None]]
+    n = len(picked)
+
+    names = np.array([o[0] for o in originators], dtype=object)
+    suns = np.array([o[1] for o in originators], dtype=object)
+    mandate_statuses = np.array(['active', 'active', 'active', 'cancelled', 'suspended'],
+                                dtype=object)
+    days = np.datetime_as_string(np.datetime64('2020-01-01') + np.arange(1800 + 45), unit='D')
+    mandate_days = rng.integers(0, 1800, size=n)
+
+    records = list(zip(
+        np.repeat(account_ids, counts).tolist(),
+        names[picked].tolist(),
+        suns[picked].tolist(),
+        np.char.add('DD-', rng.integers(100000, 999999, size=n).astype(str)).tolist(),
+        days[mandate_days].tolist(),
+        days[mandate_days + rng.integers(14, 45, size=n)].tolist(),
+        repeat('2024-12-15'),
+        mandate_statuses[rng.choice(len(mandate_statuses), size=n,
+                                    p=[0.60, 0.20, 0.05, 0.10, 0.05])].tolist(),
+    ))
+
+    with _transaction() as conn:
+        bulk_insert('core_banking.direct_debits', records, DIRECT_DEBIT_COLUMNS, conn=conn)
     print(f"  ✓ Direct Debits: {len(records)} generated")
 
 
-def generate_payment_flows():
-    """Generate payment instructions and receipts."""
-    rng = np.random.default_rng(SEED + 72)
-    engine = get_engine()
+# ── Payment flows ────────────────────────────────────────────
+# Flows draw millions of deviates, so they use the faster SFC64 bit generator.
+# Every column is drawn once for all rows. Timestamps come from one datetime64
+# sum formatted in a single pass; settlement dates index a preformatted pool
+_FLOW_START = np.datetime64('2024-07-01T00:00', 'm')
+_FLOW_DAYS = np.datetime_as_string(np.datetime64('2024-07-01') + np.arange(183 + 3), unit='D')
+SCHEME_WEIGHTS = np.array([0.30, 0.20, 0.15, 0.05, 0.02, 0.10, 0.08, 0.05, 0.03, 0.02])
 
-    with engine.connect() as conn:
-        scheme_map = {r[1]: r[0] for r in conn.execute(text(
-            "SELECT scheme_id, scheme_code FROM payments.payment_schemes"
-        )).fetchall()}
+# Categorical columns are sampled as int8 codes and only turned into labels as
+# COPY consumes each row
+PAYMENT_TYPES = ('single', 'bulk', 'standing_order')
+PAYMENT_TYPE_WEIGHTS = [0.70, 0.15, 0.15]
+PRIORITIES = ('normal', 'urgent')
+PRIORITY_WEIGHTS = [0.92, 0.08]
+INSTRUCTION_STATUSES = ('settled', 'sent', 'rejected')
+INSTRUCTION_STATUS_WEIGHTS = [0.93, 0.05, 0.02]
+RECEIPT_STATUSES = ('applied', 'received')
+RECEIPT_STATUS_WEIGHTS = [0.95, 0.05]
 
-        accounts = conn.execute(text(
-            "SELECT account_id FROM core_banking.accounts WHERE status = 'active'"
-        )).fetchall()
 
-    account_ids = [r[0] for r in accounts]
-    schemes = list(scheme_map.keys())
-    scheme_weights = np.array([0.30, 0.20, 0.15, 0.05, 0.02, 0.10, 0.08, 0.05, 0.03, 0.02])
-    scheme_weights = scheme_weights / scheme_weights.sum()
+def _flow_timestamps(rng, day_idx, size):
+    """Timestamps between 08:00 and 17:58 on the given day offsets."""
+    hours = rng.integers(8, 18, size=size)
+    minutes = rng.integers(0, 59, size=size)
+    ts = _FLOW_START + day_idx * 1440 + hours * 60 + minutes
+    return np.datetime_as_string(ts, unit='s').tolist()
+
+
+def _draw_labels(rng, labels, weights, n):
+    """Sample n labels as int8 codes, mapped back to labels lazily."""
+    codes = rng.choice(len(labels), size=n, p=weights).astype(np.int8)
+    return map(labels.__getitem__, codes)
+
+
+def _flow_lookups(rng, n):
+    """Draw account and weighted scheme IDs for n payment flows."""
+    scheme_map = registry.get_or_compute('scheme_map', _scheme_map)[0]
+    account_ids = registry.get_or_compute('status_active_account_ids', _status_active_account_ids)
+    scheme_ids = np.array(list(scheme_map.values()))
+    weights = SCHEME_WEIGHTS / SCHEME_WEIGHTS.sum()
+    return (rng.choice(account_ids, size=n).tolist(),
+            scheme_ids[rng.choice(len(scheme_ids), size=n, p=weights)].tolist())
+
+
+def generate_payment_instructions(conn=None):
+    """Generate outbound payment instructions (~500K)."""
+    rng = Generator(SFC64(SEED + 72))
 
-    # Payment Instructions (outbound) — ~500K
     print("  Generating payment instructions...")
-    pi_records = []
-    n_instructions = 500000
-    sampled_accounts = rng.choice(account_ids, size=n_instructions)
-    sampled_schemes = rng.choice(schemes, size=n_instructions, p=scheme_weights)
-
-    for i in tqdm(range(n_instructions), desc="  Payment instructions", leave=False):
-        inst_date = date(2024, 7, 1) + timedelta(days=int(rng.integers(0, 183)))
-        scheme_code = sampled_schemes[i]
-
-        pi_records.append({
-            'account_id': int(sampled_accounts[i]),
-            'scheme_id': scheme_map[scheme_code],
-            'instruction_date': f'{inst_date.isoformat()} {rng.integers(8,18):02d}:{rng.integers(0,59):02d}:00',
-            'amount': round(float(rng.lognormal(5, 1.2)), 2),
-            'currency': 'GBP',
-            'beneficiary_name': rng.choice(RETAIL_COUNTERPARTIES),
-            'beneficiary_account': generate_account_number(rng),
-            'beneficiary_sort_code': generate_sort_code(rng),
-            'reference': f'PAY-{rng.integers(100000, 999999)}',
-            'payment_type': rng.choice(['single', 'bulk', 'standing_order'], p=[0.70, 0.15, 0.15]),
-            'priority': rng.choice(['normal', 'urgent'], p=[0.92, 0.08]),
-            'status': rng.choice(['settled', 'settled', 'settled', 'sent', 'rejected'], p=[0.80, 0.08, 0.05, 0.05, 0.02]),
-            'settlement_date': (inst_date + timedelta(days=int(rng.integers(0, 3)))).isoformat(),
-        })
-
-        if len(pi_records) >= 50000:
-            cols = list(pi_records[0].keys())
-            bulk_insert('payments.payment_instructions', pi_records, cols)
-            pi_records = []
-
-    if pi_records:
-        bulk_insert('payments.payment_instructions', pi_records, list(pi_records[0].keys()))
-
-    # Payment Receipts (inbound) — ~500K
+    n = 500000
+    inst_days = rng.integers(0, 183, size=n)
+    accounts, schemes = _flow_lookups(rng, n)
+    # Columns are zipped lazily and streamed into COPY; no row list is built
+    rows = zip(
+        accounts,
+        schemes,
+        _flow_timestamps(rng, inst_days, n),
+        np.round(rng.lognormal(5, 1.2, size=n), 2).tolist(),
+        repeat('GBP'),
+        _COUNTERPARTIES[rng.integers(0, len(_COUNTERPARTIES), size=n)].tolist(),
+        generate_account_numbers(rng, n).tolist(),
+        generate_sort_codes(rng, n).tolist(),
+        np.char.add('PAY-', rng.integers(100000, 999999, size=n).astype(str)).tolist(),
+        _draw_labels(rng, PAYMENT_TYPES, PAYMENT_TYPE_WEIGHTS, n),
+        _draw_labels(rng, PRIORITIES, PRIORITY_WEIGHTS, n),
+        _draw_labels(rng, INSTRUCTION_STATUSES, INSTRUCTION_STATUS_WEIGHTS, n),
+        _FLOW_DAYS[inst_days + rng.integers(0, 3, size=n)].tolist(),
+    )
+    # Rebuilding the indexes once is cheaper than maintaining them per row
+    with _transaction(conn) as conn:
+        with indexes_dropped('payments.payment_instructions', conn):
+            bulk_insert('payments.payment_instructions', rows,
+                        PAYMENT_INSTRUCTION_COLUMNS, conn=conn)
+    print(f"  ✓ Payment Instructions: {n:,}")
+
+
+def generate_payment_receipts():
+    """Generate inbound payment receipts (~500K)."""
+    rng = Generator(SFC64(SEED + 73))
+
     print("  Generating payment receipts...")
-    pr_records = []
-    n_receipts = 500000
-    sampled_accounts = rng.choice(account_ids, size=n_receipts)
-    sampled_schemes = rng.choice(schemes, size=n_receipts, p=scheme_weights)
-
-    for i in tqdm(range(n_receipts), desc="  Payment receipts", leave=False):
-        rcpt_date = date(2024, 7, 1) + timedelta(days=int(rng.integers(0, 183)))
-        scheme_code = sampled_schemes[i]
-
-        pr_records.append({
-            'account_id': int(sampled_accounts[i]),
-            'scheme_id': scheme_map[scheme_code],
-            'receipt_date': f'{rcpt_date.isoformat()} {rng.integers(8,18):02d}:{rng.integers(0,59):02d}:00',
-            'amount': round(float(rng.lognormal(5, 1.2)), 2),
-            'currency': 'GBP',
-            'sender_name': rng.choice(RETAIL_COUNTERPARTIES),
-            'sender_account': generate_account_number(rng),
-            'sender_sort_code': generate_sort_code(rng),
-            'reference': f'RCV-{rng.integers(100000, 999999)}',
-            'status': rng.choice(['applied', 'applied', 'applied', 'received'], p=[0.85, 0.05, 0.05, 0.05]),
-        })
-
-        if len(pr_records) >= 50000:
-            cols = list(pr_records[0].keys())
-            bulk_insert('payments.payment_receipts', pr_records, cols)
-            pr_records = []
-
-    if pr_records:
-        bulk_insert('payments.payment_receipts', pr_records, list(pr_records[0].keys()))
-
-    # Failed payments — ~2% of instructions
+    n = 500000
+    accounts, schemes = _flow_lookups(rng, n)
+    rows = zip(
+        accounts,
+        schemes,
+        _flow_timestamps(rng, rng.integers(0, 183, size=n), n),
+        np.round(rng.lognormal(5, 1.2, size=n), 2).tolist(),
+        repeat('GBP'),
+        _COUNTERPARTIES[rng.integers(0, len(_COUNTERPARTIES), size=n)].tolist(),
+        generate_account_numbers(rng, n).tolist(),
+        generate_sort_codes(rng, n).tolist(),
+        np.char.add('RCV-', rng.integers(100000, 999999, size=n).astype(str)).tolist(),
+        _draw_labels(rng, RECEIPT_STATUSES, RECEIPT_STATUS_WEIGHTS, n),
+    )
+    with _transaction() as conn:
+        with indexes_dropped('payments.payment_receipts', conn):
+            bulk_insert('payments.payment_receipts', rows, PAYMENT_RECEIPT_COLUMNS, conn=conn)
+    print(f"  ✓ Payment Receipts: {n:,}")
+
+
+def generate_failed_payments(conn=None):
+    """Generate failures for up to 5000 rejected payment instructions."""
+
+    # Drawn and inserted server-side; each row's random() values are fixed in the
+    # subquery so the weighted CASE picks below read one draw per column
     print("  Generating failed payments...")
-    with engine.connect() as conn:
-        failed_instructions = conn.execute(text(
-            "SELECT instruction_id, amount FROM payments.payment_instructions WHERE status = 'rejected' LIMIT 5000"
-        )).fetchall()
-
-    fp_records = []
-    reasons = ['insufficient_funds', 'invalid_account', 'invalid_sort_code',
-               'account_closed', 'amount_limit_exceeded', 'technical_error']
-    reason_weights = np.array([0.40, 0.15, 0.10, 0.10, 0.10, 0.15])
-
-    for inst_id, amount in failed_instructions:
-        fp_records.append({
-            'instruction_id': inst_id,
-            'failure_date': f'2024-{rng.integers(7,12):02d}-{rng.integers(1,28):02d} 14:00:00',
-            'failure_reason': rng.choice(reasons, p=reason_weights),
-            'original_amount': float(amount),
-            'currency': 'GBP',
-            'resolution_status': rng.choice(['unresolved', 'retried', 'reversed'], p=[0.30, 0.40, 0.30]),
-        })
-
-    if fp_records:
-        cols = ['instruction_id', 'failure_date', 'failure_reason', 'original_amount',
-                'currency', 'resolution_status']
-        bulk_insert('payments.failed_payments', fp_records, cols)
-
-    print(f"  ✓ Payment Instructions: {n_instructions:,}")
-    print(f"  ✓ Payment Receipts: {n_receipts:,}")
-    print(f"  ✓ Failed Payments: {len(fp_records)}")
+    with _transaction(conn) as conn:
+        conn.execute(text("SELECT setseed(:seed)"), {'seed': (SEED + 74) % 1000 / 1000})
+        result = conn.execute(text("""
+            INSERT INTO payments.failed_payments (instruction_id, failure_date, failure_reason,
+                                                  original_amount, currency, resolution_status)
+            SELECT instruction_id,
+                   MAKE_TIMESTAMP(2024, 7 + FLOOR(r_month * 5)::int, 1 + FLOOR(r_day * 27)::int,
+                                  14, 0, 0),
+                   CASE WHEN r_reason < 0.40 THEN 'insufficient_funds'
+                        WHEN r_reason < 0.55 THEN 'invalid_account'
+                        WHEN r_reason < 0.65 THEN 'invalid_sort_code'
+                        WHEN r_reason < 0.75 THEN 'account_closed'
+                        WHEN r_reason < 0.85 THEN 'amount_limit_exceeded'
+                        ELSE 'technical_error' END,
+                   amount, 'GBP',
+                   CASE WHEN r_resolution < 0.30 THEN 'unresolved'
+                        WHEN r_resolution < 0.70 THEN 'retried'
+                        ELSE 'reversed' END
+            FROM (
+                SELECT instruction_id, amount,
+                       random() as r_month, random() as r_day,
+                       random() as r_reason, random() as r_resolution
+                FROM payments.payment_instructions
+                WHERE status = 'rejected'
+                ORDER BY instruction_id
+                LIMIT 5000
+            ) rejected
+        """))
+    print(f"  ✓ Failed Payments: {result.rowcount}")
+
+
+def generate_instructions_and_failures():
+    """Generate payment instructions, then their failures, in one transaction."""
+    with _transaction() as conn:
+        generate_payment_instructions(conn)
+        generate_failed_payments(conn)
 
 
 def run():
     print("\n💸 Generating Payments data...")
-    generate_standing_orders()
-    generate_direct_debits()
-    generate_payment_flows()
+    # Resolve shared lookups once so every worker receives them with the registry
+    registry.get_or_compute('active_current_account_ids', _active_current_account_ids)
+    registry.get_or_compute('status_active_account_ids', _status_active_account_ids)
+    registry.get_or_compute('scheme_map', _scheme_map)
+    # Independent writers into different tables, each in its own process and
+    # transaction; failures ride on the instructions connection so they see the
+    # new rows and commit with them
+    run_parallel(generate_standing_orders, generate_direct_debits,
+                 generate_instructions_and_failures, generate_payment_receipts)
     print("✅ Payments data complete\n")
 
 
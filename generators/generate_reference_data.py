@@ -3,28 +3,29 @@ Generate reference/lookup data:
 - Products, Chart of Accounts, Cost Centres, Payment Schemes, Branches, Date dimension
 """
 import numpy as np
-from datetime import date, timedelta
+import pandas as pd
+from datetime import date
 from generators.config import (
     PRODUCTS, CHART_OF_ACCOUNTS, COST_CENTRES, PAYMENT_SCHEMES, BRANCHES, SEED
 )
-from generators.utils.relationships import bulk_insert, registry, get_engine
+from generators.utils.relationships import bulk_insert, bulk_insert_df, registry, get_engine
 from sqlalchemy import text
 
 
 def generate_products():
     """Insert product catalogue."""
     records = []
-    for i, (code, name, cat, rate, cur, min_bal, launched) in enumerate(PRODUCTS, 1):
+    for p in PRODUCTS:
         records.append({
-            'product_code': code,
-            'name': name,
-            'category': cat,
-            'interest_rate': rate,
-            'currency': cur,
-            'min_balance': min_bal,
+            'product_code': p.code,
+            'name': p.name,
+            'category': p.category,
+            'interest_rate': p.rate,
+            'currency': p.currency,
+            'min_balance': p.min_balance,
             'is_active': True,
-            'launched_date': launched,
-            'description': f'{name} — Meridian Community Bank',
+            'launched_date': p.launched,
+            'description': f'{p.name} — Meridian Community Bank',
         })
     bulk_insert('core_banking.products', records,
                 ['product_code', 'name', 'category', 'interest_rate', 'currency',
@@ -50,15 +51,15 @@ def generate_products():
 def generate_chart_of_accounts():
     """Insert chart of accounts."""
     records = []
-    for code, name, atype, subtype, parent, level in CHART_OF_ACCOUNTS:
+    for a in CHART_OF_ACCOUNTS:
         records.append({
-            'account_code': code,
-            'account_name': name,
-            'account_type': atype,
-            'account_subtype': subtype,
-            'parent_code': parent,
-            'hierarchy_level': level,
-            'is_posting_account': level >= 2,
+            'account_code': a.code,
+            'account_name': a.name,
+            'account_type': a.type,
+            'account_subtype': a.subtype,
+            'parent_code': a.parent,
+            'hierarchy_level': a.level,
+            'is_posting_account': a.level >= 2,
             'is_active': True,
         })
     bulk_insert('gl.chart_of_accounts', records,
@@ -73,12 +74,12 @@ def generate_chart_of_accounts():
 def generate_cost_centres():
     """Insert cost centres."""
     records = []
-    for code, name, dept, mgr in COST_CENTRES:
+    for cc in COST_CENTRES:
         records.append({
-            'cost_centre_code': code,
-            'cost_centre_name': name,
-            'department': dept,
-            'manager': mgr,
+            'cost_centre_code': cc.code,
+            'cost_centre_name': cc.name,
+            'department': cc.department,
+            'manager': cc.manager,
             'is_active': True,
         })
     bulk_insert('gl.cost_centres', records,
@@ -92,14 +93,14 @@ def generate_cost_centres():
 def generate_payment_schemes():
     """Insert payment scheme reference data."""
     records = []
-    for code, name, stype, max_amt, settle, hours in PAYMENT_SCHEMES:
+    for ps in PAYMENT_SCHEMES:
         records.append({
-            'scheme_code': code,
-            'scheme_name': name,
-            'scheme_type': stype,
-            'max_amount': max_amt,
-            'settlement_cycle': settle,
-            'operating_hours': hours,
+            'scheme_code': ps.code,
+            'scheme_name': ps.name,
+            'scheme_type': ps.type,
+            'max_amount': ps.max_amount,
+            'settlement_cycle': ps.settlement_cycle,
+            'operating_hours': ps.operating_hours,
             'is_active': True,
         })
     bulk_insert('payments.payment_schemes', records,
@@ -118,14 +119,14 @@ def generate_payment_schemes():
 def generate_branches():
     """Insert branch dimension."""
     records = []
-    for code, name, region, city, postcode, btype in BRANCHES:
+    for b in BRANCHES:
         records.append({
-            'branch_code': code,
-            'branch_name': name,
-            'region': region,
-            'city': city,
-            'postcode': postcode,
-            'branch_type': btype,
+            'branch_code': b.code,
+            'branch_name': b.name,
+            'region': b.region,
+            'city': b.city,
+            'postcode': b.postcode,
+            'branch_type': b.type,
             'is_active': True,
         })
     bulk_insert('warehouse_core.dim_branch', records,
@@ -147,45 +148,34 @@ def generate_date_dimension():
         date(2025, 12, 25), date(2025, 12, 26),
     }
 
-    start = date(2020, 1, 1)
-    end = date(2026, 12, 31)
-    records = []
-    d = start
-    while d <= end:
-        is_month_end = (d + timedelta(days=1)).month != d.month
-        is_quarter_end = is_month_end and d.month in (3, 6, 9, 12)
-        is_year_end = d.month == 12 and d.day == 31
-        fiscal_year = d.year if d.month >= 4 else d.year - 1
-        fiscal_quarter = ((d.month - 4) % 12) // 3 + 1
-
-        records.append({
-            'date_key': int(d.strftime('%Y%m%d')),
-            'full_date': d.isoformat(),
-            'day_of_week': d.isoweekday(),
-            'day_name': d.strftime('%A'),
-            'day_of_month': d.day,
-            'day_of_year': d.timetuple().tm_yday,
-            'week_of_year': d.isocalendar()[1],
-            'iso_week': d.isocalendar()[1],
-            'month_number': d.month,
-            'month_name': d.strftime('%B'),
-            'month_short': d.strftime('%b'),
-            'quarter': (d.month - 1) // 3 + 1,
-            'quarter_name': f'Q{(d.month - 1) // 3 + 1}',
-            'year': d.year,
-            'fiscal_year': fiscal_year,
-            'fiscal_quarter': fiscal_quarter,
-            'is_weekend': d.isoweekday() >= 6,
-            'is_bank_holiday': d in bank_holidays,
-            'is_month_end': is_month_end,
-            'is_quarter_end': is_quarter_end,
-            'is_year_end': is_year_end,
-        })
-        d += timedelta(days=1)
-
-    bulk_insert('warehouse_core.dim_date', records,
-                list(records[0].keys()))
-    print(f"  ✓ Date Dimension: {len(records)} days (2020-2026)")
+    # Every attribute is derived column-wise from one date range
+    dr = pd.date_range('2020-01-01', '2026-12-31', freq='D')
+    quarter = dr.quarter
+    df = pd.DataFrame({
+        'date_key': dr.year * 10000 + dr.month * 100 + dr.day,
+        'full_date': dr.strftime('%Y-%m-%d'),
+        'day_of_week': dr.dayofweek + 1,
+        'day_name': dr.day_name(),
+        'day_of_month': dr.day,
+        'day_of_year': dr.dayofyear,
+        'week_of_year': dr.isocalendar().week.to_numpy(),
+        'iso_week': dr.isocalendar().week.to_numpy(),
+        'month_number': dr.month,
+        'month_name': dr.month_name(),
+        'month_short': dr.strftime('%b'),
+        'quarter': quarter,
+        'quarter_name': 'Q' + quarter.astype(str),
+        'year': dr.year,
+        'fiscal_year': np.where(dr.month >= 4, dr.year, dr.year - 1),
+        'fiscal_quarter': (dr.month - 4) % 12 // 3 + 1,
+        'is_weekend': dr.dayofweek >= 5,
+        'is_bank_holiday': dr.isin(pd.to_datetime(sorted(bank_holidays))),
+        'is_month_end': dr.is_month_end,
+        'is_quarter_end': dr.is_quarter_end,
+        'is_year_end': dr.is_year_end,
+    })
+    bulk_insert_df('warehouse_core.dim_date', df)
+    print(f"  ✓ Date Dimension: {len(df)} days (2020-2026)")
 
 
 def run():
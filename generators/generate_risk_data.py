@@ -4,11 +4,18 @@ Generate risk and compliance data:
 """
 import numpy as np
 import json
+from itertools import repeat
 from datetime import date, timedelta
-from tqdm import tqdm
 from sqlalchemy import text
 from generators.config import SEED, AML_FLAG_RATIO, CUSTOMER_COUNT
-from generators.utils.relationships import bulk_insert, registry, get_engine
+from generators.utils.relationships import bulk_insert, registry, get_engine, run_parallel
+
+# Credit score factors by tier (score < 500, < 700, >= 700), encoded once and indexed
+FACTOR_JSON = np.array([
+    json.dumps(['missed_payments', 'high_utilisation', 'short_credit_history']),
+    json.dumps(['moderate_utilisation', 'limited_credit_mix']),
+    json.dumps(['low_utilisation', 'long_credit_history', 'diverse_credit_mix']),
+], dtype=object)
 
 
 def generate_credit_scores():
@@ -16,49 +23,31 @@ def generate_credit_scores():
     rng = np.random.default_rng(SEED + 30)
     customer_ids = registry.get_ids('active_customer_ids')
 
-    records = []
-    score_bands = {
-        (0, 299): 'very_poor',
-        (300, 499): 'poor',
-        (500, 649): 'fair',
-        (650, 799): 'good',
-        (800, 999): 'excellent',
-    }
-
-    for cid in tqdm(customer_ids, desc="  Credit scores", leave=False):
-        # Score follows normal distribution centered on 650
-        score = int(rng.normal(650, 150))
-        score = max(0, min(999, score))
-
-        band = 'fair'
-        for (lo, hi), b in score_bands.items():
-            if lo <= score <= hi:
-                band = b
-                break
-
-        factors = []
-        if score < 500:
-            factors = ['missed_payments', 'high_utilisation', 'short_credit_history']
-        elif score < 700:
-            factors = ['moderate_utilisation', 'limited_credit_mix']
-        else:
-            factors = ['low_utilisation', 'long_credit_history', 'diverse_credit_mix']
-
-        records.append({
-            'customer_id': int(cid),
-            'score_date': '2024-12-01',
-            'score_value': score,
-            'score_band': band,
-            'model_name': 'MCB_SCORE_V3',
-            'model_version': '3.2.1',
-            'factors': json.dumps(factors),
-            'is_current': True,
-        })
+    # Bands start at 0/300/500/650/800
+    band_edges = np.array([300, 500, 650, 800])
+    bands = np.array(['very_poor', 'poor', 'fair', 'good', 'excellent'], dtype=object)
+
+    # Score follows normal distribution centered on 650; one draw for all customers
+    n = len(customer_ids)
+    scores = np.clip(rng.normal(650, 150, size=n).astype(int), 0, 999)
+    factor_idx = (scores >= 500).astype(int) + (scores >= 700)
+
+    # Columns are zipped lazily and streamed into COPY; no row list is built
+    rows = zip(
+        customer_ids.tolist(),
+        repeat('2024-12-01'),
+        scores.tolist(),
+        bands[np.digitize(scores, band_edges)].tolist(),
+        repeat('MCB_SCORE_V3'),
+        repeat('3.2.1'),
+        FACTOR_JSON[factor_idx].tolist(),
+        repeat(True),
+    )
 
     cols = ['customer_id', 'score_date', 'score_value', 'score_band',
             'model_name', 'model_version', 'factors', 'is_current']
-    bulk_insert('risk.credit_scores', records, cols)
-    print(f"  ✓ Credit Scores: {len(records)} generated")
+    bulk_insert('risk.credit_scores', rows, cols)
+    print(f"  ✓ Credit Scores: {n} generated")
 
 
 def generate_credit_applications():
@@ -76,42 +65,48 @@ def generate_credit_applications():
         )).fetchall()
     loan_product_ids = [r[0] for r in products]
 
-    records = []
-    decisions = ['approved', 'approved', 'approved', 'declined', 'declined', 'referred', 'withdrawn']
-    purposes = ['home_improvement', 'car_purchase', 'debt_consolidation', 'business_expansion',
-                'property_purchase', 'education', 'medical', 'other']
-    employment = ['employed', 'self_employed', 'retired', 'student', 'unemployed']
-
-    for cid in tqdm(applicants, desc="  Credit applications", leave=False):
-        app_date = date(2024, 1, 1) + timedelta(days=int(rng.integers(0, 365)))
-        amount = round(float(rng.lognormal(9.0, 1.2)), 2)  # ~£8k median
-        amount = min(amount, 2000000)
-
-        decision = rng.choice(decisions)
-        approved_amount = round(amount * rng.uniform(0.7, 1.0), 2) if decision == 'approved' else None
-
-        records.append({
-            'customer_id': int(cid),
-            'product_id': int(rng.choice(loan_product_ids)),
-            'application_date': app_date.isoformat(),
-            'requested_amount': amount,
-            'approved_amount': approved_amount,
-            'term_months': int(rng.choice([12, 24, 36, 48, 60, 120, 180, 240, 300])),
-            'interest_rate': round(float(rng.uniform(0.03, 0.15)), 4),
-            'purpose': rng.choice(purposes),
-            'employment_status': rng.choice(employment, p=[0.65, 0.15, 0.10, 0.05, 0.05]),
-            'annual_income': round(float(rng.lognormal(10.3, 0.6)), 2),
-            'credit_score_at_application': int(rng.normal(650, 150)),
-            'decision': decision,
-            'decision_date': (app_date + timedelta(days=int(rng.integers(1, 14)))).isoformat(),
-            'decision_reason': 'Automated approval' if decision == 'approved' else 'Policy criteria not met',
-            'affordability_ratio': round(float(rng.uniform(0.15, 0.55)), 2),
-            'underwriter': f'UW-{rng.integers(1, 20):03d}',
-        })
-
-    cols = list(records[0].keys())
-    bulk_insert('risk.credit_applications', records, cols)
-    print(f"  ✓ Credit Applications: {len(records)} generated")
+    decisions = np.array(['approved', 'approved', 'approved', 'declined', 'declined',
+                          'referred', 'withdrawn'], dtype=object)
+    purposes = np.array(['home_improvement', 'car_purchase', 'debt_consolidation',
+                         'business_expansion', 'property_purchase', 'education', 'medical',
+                         'other'], dtype=object)
+    employment = np.array(['employed', 'self_employed', 'retired', 'student', 'unemployed'],
+                          dtype=object)
+    terms = np.array([12, 24, 36, 48, 60, 120, 180, 240, 300])
+    days = np.datetime_as_string(np.datetime64('2024-01-01') + np.arange(365 + 14), unit='D')
+
+    # Every column is drawn once for all applicants
+    n = len(applicants)
+    app_days = rng.integers(0, 365, size=n)
+    amounts = np.minimum(np.round(rng.lognormal(9.0, 1.2, size=n), 2), 2000000)  # ~£8k median
+    decision = decisions[rng.integers(0, len(decisions), size=n)]
+    approved = decision == 'approved'
+
+    rows = zip(
+        applicants.tolist(),
+        np.asarray(loan_product_ids)[rng.integers(0, len(loan_product_ids), size=n)].tolist(),
+        days[app_days].tolist(),
+        amounts.tolist(),
+        np.where(approved, np.round(amounts * rng.uniform(0.7, 1.0, size=n), 2), None).tolist(),
+        terms[rng.integers(0, len(terms), size=n)].tolist(),
+        np.round(rng.uniform(0.03, 0.15, size=n), 4).tolist(),
+        purposes[rng.integers(0, len(purposes), size=n)].tolist(),
+        employment[rng.choice(len(employment), size=n, p=[0.65, 0.15, 0.10, 0.05, 0.05])].tolist(),
+        np.round(rng.lognormal(10.3, 0.6, size=n), 2).tolist(),
+        rng.normal(650, 150, size=n).astype(int).tolist(),
+        decision.tolist(),
+        days[app_days + rng.integers(1, 14, size=n)].tolist(),
+        np.where(approved, 'Automated approval', 'Policy criteria not met').tolist(),
+        np.round(rng.uniform(0.15, 0.55, size=n), 2).tolist(),
+        np.char.add('UW-', np.char.zfill(rng.integers(1, 20, size=n).astype(str), 3)).tolist(),
+    )
+
+    cols = ['customer_id', 'product_id', 'application_date', 'requested_amount',
+            'approved_amount', 'term_months', 'interest_rate', 'purpose', 'employment_status',
+            'annual_income', 'credit_score_at_application', 'decision', 'decision_date',
+            'decision_reason', 'affordability_ratio', 'underwriter']
+    bulk_insert('risk.credit_applications', rows, cols)
+    print(f"  ✓ Credit Applications: {n} generated")
 
 
 def generate_aml_alerts():
@@ -123,38 +118,47 @@ def generate_aml_alerts():
     n_alerts = int(CUSTOMER_COUNT * AML_FLAG_RATIO * 5)  # Multiple alerts per flagged customer
     flagged_customers = rng.choice(customer_ids, size=int(CUSTOMER_COUNT * AML_FLAG_RATIO), replace=False)
 
-    alert_types = ['unusual_activity', 'large_cash', 'structuring', 'rapid_movement',
-                   'high_risk_jurisdiction', 'sanctions_hit', 'pep_activity', 'dormant_reactivation']
-    alert_weights = np.array([0.30, 0.20, 0.15, 0.10, 0.08, 0.05, 0.07, 0.05])
-    statuses = ['open', 'investigating', 'escalated', 'sar_filed', 'false_positive', 'closed']
-    status_weights = np.array([0.10, 0.15, 0.05, 0.05, 0.35, 0.30])
-
-    records = []
-    for i in range(n_alerts):
-        cid = int(rng.choice(flagged_customers))
-        alert_date = date(2024, 7, 1) + timedelta(days=int(rng.integers(0, 183)))
-        status = rng.choice(statuses, p=status_weights)
-
-        records.append({
-            'customer_id': cid,
-            'alert_date': f'{alert_date.isoformat()} {rng.integers(8,18):02d}:{rng.integers(0,59):02d}:00',
-            'alert_type': rng.choice(alert_types, p=alert_weights),
-            'rule_id': f'AML-R{rng.integers(1, 50):03d}',
-            'rule_name': f'Rule {rng.integers(1, 50)}',
-            'trigger_amount': round(float(rng.lognormal(8, 1.5)), 2),
-            'trigger_details': 'Automated alert from transaction monitoring system',
-            'risk_score': round(float(rng.uniform(10, 95)), 2),
-            'status': status,
-            'assigned_to': f'MLRO-{rng.integers(1, 8):03d}',
-            'resolution_date': (alert_date + timedelta(days=int(rng.integers(1, 60)))).isoformat() + ' 17:00:00' if status in ('false_positive', 'closed', 'sar_filed') else None,
-            'resolution_notes': 'Reviewed and resolved' if status in ('false_positive', 'closed') else None,
-        })
+    alert_types = np.array(['unusual_activity', 'large_cash', 'structuring', 'rapid_movement',
+                            'high_risk_jurisdiction', 'sanctions_hit', 'pep_activity',
+                            'dormant_reactivation'], dtype=object)
+    alert_cdf = np.cumsum([0.30, 0.20, 0.15, 0.10, 0.08, 0.05, 0.07, 0.05])
+    alert_cdf /= alert_cdf[-1]
+    statuses = np.array(['open', 'investigating', 'escalated', 'sar_filed', 'false_positive',
+                         'closed'], dtype=object)
+    status_cdf = np.cumsum([0.10, 0.15, 0.05, 0.05, 0.35, 0.30])
+    status_cdf /= status_cdf[-1]
+
+    # Every column is drawn once for all alerts; resolution fields are masked by status
+    n = n_alerts
+    customers = flagged_customers[rng.integers(0, len(flagged_customers), size=n)]
+    alert_days = np.datetime64('2024-07-01') + rng.integers(0, 183, size=n)
+    alert_minutes = rng.integers(8, 18, size=n) * 60 + rng.integers(0, 59, size=n)
+    status = statuses[np.searchsorted(status_cdf, rng.random(n), side='right')]
+    resolved = np.isin(status, ['false_positive', 'closed', 'sar_filed'])
+    resolution_days = alert_days + rng.integers(1, 60, size=n)
+
+    rows = zip(
+        customers.tolist(),
+        np.datetime_as_string(alert_days + alert_minutes.astype('timedelta64[m]'), unit='s').tolist(),
+        alert_types[np.searchsorted(alert_cdf, rng.random(n), side='right')].tolist(),
+        np.char.add('AML-R', np.char.zfill(rng.integers(1, 50, size=n).astype(str), 3)).tolist(),
+        np.char.add('Rule ', rng.integers(1, 50, size=n).astype(str)).tolist(),
+        np.round(rng.lognormal(8, 1.5, size=n), 2).tolist(),
+        repeat('Automated alert from transaction monitoring system'),
+        np.round(rng.uniform(10, 95, size=n), 2).tolist(),
+        status.tolist(),
+        np.char.add('MLRO-', np.char.zfill(rng.integers(1, 8, size=n).astype(str), 3)).tolist(),
+        np.where(resolved, np.char.add(np.datetime_as_string(resolution_days), ' 17:00:00'),
+                 None).tolist(),
+        np.where(np.isin(status, ['false_positive', 'closed']), 'Reviewed and resolved',
+                 None).tolist(),
+    )
 
     cols = ['customer_id', 'alert_date', 'alert_type', 'rule_id', 'rule_name',
             'trigger_amount', 'trigger_details', 'risk_score', 'status',
             'assigned_to', 'resolution_date', 'resolution_notes']
-    bulk_insert('risk.aml_alerts', records, cols)
-    print(f"  ✓ AML Alerts: {len(records)} generated")
+    bulk_insert('risk.aml_alerts', rows, cols)
+    print(f"  ✓ AML Alerts: {n} generated")
     return flagged_customers
 
 
@@ -166,33 +170,45 @@ def generate_aml_cases(flagged_customers):
     n_cases = max(50, int(len(flagged_customers) * 0.5))
     case_customers = rng.choice(flagged_customers, size=min(n_cases, len(flagged_customers)), replace=False)
 
-    records = []
-    for i, cid in enumerate(case_customers):
-        opened = date(2024, 7, 1) + timedelta(days=int(rng.integers(0, 183)))
-        status = rng.choice(
-            ['open', 'investigating', 'pending_sar', 'sar_filed', 'closed_no_action', 'closed_action_taken'],
-            p=[0.15, 0.20, 0.05, 0.10, 0.35, 0.15]
-        )
-
-        records.append({
-            'case_ref': f'AML-2024-{i+1:04d}',
-            'customer_id': int(cid),
-            'opened_date': opened.isoformat(),
-            'case_type': rng.choice(['investigation', 'enhanced_monitoring', 'sar', 'referral'],
-                                     p=[0.50, 0.25, 0.15, 0.10]),
-            'priority': rng.choice(['low', 'medium', 'high', 'critical'], p=[0.20, 0.40, 0.30, 0.10]),
-            'description': 'Suspicious transaction pattern identified by monitoring system',
-            'total_suspicious_amount': round(float(rng.lognormal(9, 1.5)), 2),
-            'status': status,
-            'sar_reference': f'SAR-2024-{rng.integers(1000, 9999)}' if status in ('sar_filed', 'pending_sar') else None,
-            'assigned_to': f'MLRO-{rng.integers(1, 5):03d}',
-            'closed_date': (opened + timedelta(days=int(rng.integers(14, 90)))).isoformat() if 'closed' in status else None,
-            'outcome_notes': 'Case resolved' if 'closed' in status else None,
-        })
-
-    cols = list(records[0].keys())
-    bulk_insert('risk.aml_cases', records, cols)
-    print(f"  ✓ AML Cases: {len(records)} generated")
+    statuses = np.array(['open', 'investigating', 'pending_sar', 'sar_filed', 'closed_no_action',
+                         'closed_action_taken'], dtype=object)
+    status_cdf = np.cumsum([0.15, 0.20, 0.05, 0.10, 0.35, 0.15])
+    status_cdf /= status_cdf[-1]
+    case_types = np.array(['investigation', 'enhanced_monitoring', 'sar', 'referral'], dtype=object)
+    case_type_cdf = np.cumsum([0.50, 0.25, 0.15, 0.10])
+    case_type_cdf /= case_type_cdf[-1]
+    priorities = np.array(['low', 'medium', 'high', 'critical'], dtype=object)
+    priority_cdf = np.cumsum([0.20, 0.40, 0.30, 0.10])
+    priority_cdf /= priority_cdf[-1]
+
+    # Dates and references are formatted once per column; SAR and closure fields masked by status
+    n = len(case_customers)
+    opened = np.datetime64('2024-07-01') + rng.integers(0, 183, size=n)
+    status = statuses[np.searchsorted(status_cdf, rng.random(n), side='right')]
+    has_sar = np.isin(status, ['sar_filed', 'pending_sar'])
+    closed = np.isin(status, ['closed_no_action', 'closed_action_taken'])
+
+    rows = zip(
+        np.char.add('AML-2024-', np.char.zfill(np.arange(1, n + 1).astype(str), 4)).tolist(),
+        case_customers.tolist(),
+        np.datetime_as_string(opened).tolist(),
+        case_types[np.searchsorted(case_type_cdf, rng.random(n), side='right')].tolist(),
+        priorities[np.searchsorted(priority_cdf, rng.random(n), side='right')].tolist(),
+        repeat('Suspicious transaction pattern identified by monitoring system'),
+        np.round(rng.lognormal(9, 1.5, size=n), 2).tolist(),
+        status.tolist(),
+        np.where(has_sar, np.char.add('SAR-2024-', rng.integers(1000, 9999, size=n).astype(str)),
+                 None).tolist(),
+        np.char.add('MLRO-', np.char.zfill(rng.integers(1, 5, size=n).astype(str), 3)).tolist(),
+        np.where(closed, np.datetime_as_string(opened + rng.integers(14, 90, size=n)), None).tolist(),
+        np.where(closed, 'Case resolved', None).tolist(),
+    )
+
+    cols = ['case_ref', 'customer_id', 'opened_date', 'case_type', 'priority', 'description',
+            'total_suspicious_amount', 'status', 'sar_reference', 'assigned_to', 'closed_date',
+            'outcome_notes']
+    bulk_insert('risk.aml_cases', rows, cols)
+    print(f"  ✓ AML Cases: {n} generated")
 
 
 def generate_sanctions_screening():
@@ -200,29 +216,46 @@ def generate_sanctions_screening():
     rng = np.random.default_rng(SEED + 34)
     customer_ids = registry.get_ids('active_customer_ids')
 
-    lists_checked = ['OFSI', 'EU Sanctions', 'UN Sanctions', 'OFAC SDN']
-    records = []
-
-    for cid in tqdm(customer_ids, desc="  Sanctions screening", leave=False):
-        screen_date = date(2024, 1, 1) + timedelta(days=int(rng.integers(0, 365)))
-        match_found = rng.random() < 0.003  # 0.3% match rate
-
-        records.append({
-            'customer_id': int(cid),
-            'screening_date': f'{screen_date.isoformat()} 02:00:00',
-            'screening_type': rng.choice(['periodic', 'batch', 'onboarding'], p=[0.60, 0.30, 0.10]),
-            'list_checked': rng.choice(lists_checked),
-            'match_found': match_found,
-            'match_score': round(float(rng.uniform(70, 99)), 2) if match_found else None,
-            'match_details': 'Potential name match — requires manual review' if match_found else None,
-            'status': rng.choice(['potential_match', 'false_positive'], p=[0.3, 0.7]) if match_found else 'clear',
-            'reviewed_by': f'COMP-{rng.integers(1, 10):03d}' if match_found else None,
-            'review_date': (screen_date + timedelta(days=int(rng.integers(1, 5)))).isoformat() + ' 14:00:00' if match_found else None,
-        })
-
-    cols = list(records[0].keys())
-    bulk_insert('risk.sanctions_screening', records, cols)
-    print(f"  ✓ Sanctions Screening: {len(records)} records")
+    lists_checked = np.array(['OFSI', 'EU Sanctions', 'UN Sanctions', 'OFAC SDN'], dtype=object)
+    screening_types = np.array(['periodic', 'batch', 'onboarding'], dtype=object)
+    match_statuses = np.array(['potential_match', 'false_positive'], dtype=object)
+
+    # Every column is drawn once for all customers; the rare match fields are
+    # drawn only for the matches and dropped into otherwise empty columns
+    n = len(customer_ids)
+    screen_days = np.datetime64('2024-01-01') + rng.integers(0, 365, size=n)
+    match_found = rng.random(n) < 0.003  # 0.3% match rate
+    k = int(match_found.sum())
+
+    match_score = np.full(n, None, dtype=object)
+    match_details = np.full(n, None, dtype=object)
+    status = np.full(n, 'clear', dtype=object)
+    reviewed_by = np.full(n, None, dtype=object)
+    review_date = np.full(n, None, dtype=object)
+    match_score[match_found] = np.round(rng.uniform(70, 99, size=k), 2)
+    match_details[match_found] = 'Potential name match — requires manual review'
+    status[match_found] = match_statuses[rng.choice(len(match_statuses), size=k, p=[0.3, 0.7])]
+    reviewed_by[match_found] = np.char.add('COMP-', np.char.zfill(rng.integers(1, 10, size=k).astype(str), 3))
+    review_date[match_found] = np.char.add(
+        np.datetime_as_string(screen_days[match_found] + rng.integers(1, 5, size=k)), ' 14:00:00')
+
+    rows = zip(
+        customer_ids.tolist(),
+        np.char.add(np.datetime_as_string(screen_days), ' 02:00:00').tolist(),
+        screening_types[rng.choice(len(screening_types), size=n, p=[0.60, 0.30, 0.10])].tolist(),
+        lists_checked[rng.integers(0, len(lists_checked), size=n)].tolist(),
+        match_found.tolist(),
+        match_score.tolist(),
+        match_details.tolist(),
+        status.tolist(),
+        reviewed_by.tolist(),
+        review_date.tolist(),
+    )
+
+    cols = ['customer_id', 'screening_date', 'screening_type', 'list_checked', 'match_found',
+            'match_score', 'match_details', 'status', 'reviewed_by', 'review_date']
+    bulk_insert('risk.sanctions_screening', rows, cols)
+    print(f"  ✓ Sanctions Screening: {n} records")
 
 
 def generate_risk_assessments():
@@ -230,36 +263,46 @@ def generate_risk_assessments():
     rng = np.random.default_rng(SEED + 35)
     customer_ids = registry.get_ids('active_customer_ids')
 
-    records = []
-    risk_levels = ['low', 'medium', 'high', 'very_high']
-    risk_weights = np.array([0.35, 0.40, 0.20, 0.05])
-
-    for cid in tqdm(customer_ids, desc="  Risk assessments", leave=False):
-        assess_date = date(2024, 1, 1) + timedelta(days=int(rng.integers(0, 365)))
-        overall = rng.choice(risk_levels, p=risk_weights)
-        is_edd = overall in ('high', 'very_high')
-
-        records.append({
-            'customer_id': int(cid),
-            'assessment_date': assess_date.isoformat(),
-            'assessment_type': 'enhanced_edd' if is_edd else 'standard_cdd',
-            'overall_risk': overall,
-            'country_risk': rng.choice(risk_levels[:3], p=[0.60, 0.30, 0.10]),
-            'product_risk': rng.choice(risk_levels[:3], p=[0.50, 0.35, 0.15]),
-            'channel_risk': rng.choice(['low', 'medium'], p=[0.70, 0.30]),
-            'occupation_risk': rng.choice(risk_levels[:3], p=[0.55, 0.30, 0.15]),
-            'source_of_funds': rng.choice(['employment', 'business', 'investments', 'inheritance', 'pension']),
-            'source_of_wealth': rng.choice(['salary', 'business_profits', 'property', 'investments', 'inheritance']),
-            'pep_status': bool(rng.random() < 0.02),
-            'adverse_media': bool(rng.random() < 0.01),
-            'next_review_date': (assess_date + timedelta(days=365 if not is_edd else 180)).isoformat(),
-            'assessed_by': f'COMP-{rng.integers(1, 10):03d}',
-            'notes': None,
-        })
-
-    cols = list(records[0].keys())
-    bulk_insert('risk.risk_assessments', records, cols)
-    print(f"  ✓ Risk Assessments: {len(records)} generated")
+    risk_levels = np.array(['low', 'medium', 'high', 'very_high'], dtype=object)
+    channel_risks = np.array(['low', 'medium'], dtype=object)
+    funds_sources = np.array(['employment', 'business', 'investments', 'inheritance', 'pension'],
+                             dtype=object)
+    wealth_sources = np.array(['salary', 'business_profits', 'property', 'investments',
+                               'inheritance'], dtype=object)
+    risk_cdf = np.cumsum([0.35, 0.40, 0.20, 0.05])
+    risk_cdf /= risk_cdf[-1]
+    days = np.datetime_as_string(np.datetime64('2024-01-01') + np.arange(365 + 365), unit='D')
+
+    # Every column is drawn once for all customers; EDD cases review after 180 days
+    n = len(customer_ids)
+    assess_days = rng.integers(0, 365, size=n)
+    overall = risk_levels[np.searchsorted(risk_cdf, rng.random(n), side='right')]
+    is_edd = np.isin(overall, ['high', 'very_high'])
+
+    rows = zip(
+        customer_ids.tolist(),
+        days[assess_days].tolist(),
+        np.where(is_edd, 'enhanced_edd', 'standard_cdd').tolist(),
+        overall.tolist(),
+        risk_levels[rng.choice(3, size=n, p=[0.60, 0.30, 0.10])].tolist(),
+        risk_levels[rng.choice(3, size=n, p=[0.50, 0.35, 0.15])].tolist(),
+        channel_risks[rng.choice(len(channel_risks), size=n, p=[0.70, 0.30])].tolist(),
+        risk_levels[rng.choice(3, size=n, p=[0.55, 0.30, 0.15])].tolist(),
+        funds_sources[rng.integers(0, len(funds_sources), size=n)].tolist(),
+        wealth_sources[rng.integers(0, len(wealth_sources), size=n)].tolist(),
+        (rng.random(n) < 0.02).tolist(),
+        (rng.random(n) < 0.01).tolist(),
+        days[assess_days + np.where(is_edd, 180, 365)].tolist(),
+        np.char.add('COMP-', np.char.zfill(rng.integers(1, 10, size=n).astype(str), 3)).tolist(),
+        repeat(None),
+    )
+
+    cols = ['customer_id', 'assessment_date', 'assessment_type', 'overall_risk', 'country_risk',
+            'product_risk', 'channel_risk', 'occupation_risk', 'source_of_funds',
+            'source_of_wealth', 'pep_status', 'adverse_media', 'next_review_date',
+            'assessed_by', 'notes']
+    bulk_insert('risk.risk_assessments', rows, cols)
+    print(f"  ✓ Risk Assessments: {n} generated")
 
 
 def generate_regulatory_reports():
@@ -297,21 +340,23 @@ def generate_regulatory_reports():
             submitted = rng.random() > 0.05  # 95% submitted
             status = 'submitted' if submitted else rng.choice(['draft', 'in_review'])
 
-            records.append({
-                'report_code': report_code,
-                'report_name': report_name,
-                'regulator': regulator,
-                'frequency': freq,
-                'reporting_period': period.isoformat(),
-                'submission_deadline': deadline.isoformat(),
-                'actual_submission': (deadline - timedelta(days=int(rng.integers(1, 10)))).isoformat() + ' 16:00:00' if submitted else None,
-                'status': status,
-                'prepared_by': f'FIN-{rng.integers(1, 5):03d}',
-                'approved_by': 'David Okonkwo' if submitted else None,
-                'notes': None,
-            })
-
-    cols = list(records[0].keys())
+            records.append((
+                report_code,
+                report_name,
+                regulator,
+                freq,
+                period.isoformat(),
+                deadline.isoformat(),
+                (deadline - timedelta(days=int(rng.integers(1, 10)))).isoformat() + ' 16:00:00' if submitted else None,
+                status,
+                f'FIN-{rng.integers(1, 5):03d}',
+                'David Okonkwo' if submitted else None,
+                None,
+            ))
+
+    cols = ['report_code', 'report_name', 'regulator', 'frequency', 'reporting_period',
+            'submission_deadline', 'actual_submission', 'status', 'prepared_by', 'approved_by',
+            'notes']
     bulk_insert('risk.regulatory_reports', records, cols)
     print(f"  ✓ Regulatory Reports: {len(records)} generated")
 
@@ -319,12 +364,12 @@ def generate_regulatory_reports():
 def run():
     """Generate all risk and compliance data."""
     print("\n🛡️  Generating risk & compliance data...")
-    generate_credit_scores()
+    # One row per active customer each, into separate tables
+    run_parallel(generate_credit_scores, generate_sanctions_screening,
+                 generate_risk_assessments)
     generate_credit_applications()
     flagged = generate_aml_alerts()
     generate_aml_cases(flagged)
-    generate_sanctions_screening()
-    generate_risk_assessments()
     generate_regulatory_reports()
     print("✅ Risk & compliance data complete\n")
 
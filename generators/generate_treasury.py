@@ -21,31 +21,35 @@ def generate_treasury_positions():
         ('interest_rate_swap', 'banking_book', 'IRS {}', (10, 100)),
     ]
 
-    counterparties = ['Barclays', 'HSBC', 'Lloyds', 'NatWest', 'Standard Chartered',
-                      'Goldman Sachs', 'JP Morgan', 'Deutsche Bank', 'BNP Paribas']
+    counterparties = np.array(['Barclays', 'HSBC', 'Lloyds', 'NatWest', 'Standard Chartered',
+                               'Goldman Sachs', 'JP Morgan', 'Deutsche Bank', 'BNP Paribas'],
+                              dtype=object)
+    currencies = np.array(['GBP', 'GBP', 'GBP', 'USD', 'EUR'], dtype=object)
 
     for month in range(7, 13):  # Jul-Dec 2024
-        pos_date = date(2024, month, 28)
+        pos_date = np.datetime64(f'2024-{month:02d}-28')
         for inst_type, book, name_tmpl, (n_min, n_max) in instruments:
-            n_positions = rng.integers(n_min, n_max)
-            for i in range(n_positions):
-                notional = round(float(rng.lognormal(14, 1.5)), 2)
-                notional = min(notional, 500_000_000)
-
-                records.append({
-                    'position_date': pos_date.isoformat(),
-                    'instrument_type': inst_type,
-                    'instrument_ref': f'{inst_type[:3].upper()}-{rng.integers(1000,9999)}',
-                    'counterparty': rng.choice(counterparties),
-                    'notional_amount': notional,
-                    'currency': rng.choice(['GBP', 'GBP', 'GBP', 'USD', 'EUR']),
-                    'market_value': round(notional * rng.uniform(0.85, 1.15), 2),
-                    'book': book,
-                    'maturity_date': (pos_date + timedelta(days=int(rng.integers(30, 3650)))).isoformat(),
-                    'yield_rate': round(float(rng.uniform(0.01, 0.08)), 6),
-                })
-
-    cols = list(records[0].keys())
+            # Each instrument's positions for the month are drawn as arrays
+            n = int(rng.integers(n_min, n_max))
+            notional = np.minimum(np.round(rng.lognormal(14, 1.5, size=n), 2), 500_000_000)
+
+            records.extend(zip(
+                [str(pos_date)] * n,
+                [inst_type] * n,
+                np.char.add(f'{inst_type[:3].upper()}-',
+                            rng.integers(1000, 9999, size=n).astype(str)).tolist(),
+                counterparties[rng.integers(0, len(counterparties), size=n)].tolist(),
+                notional.tolist(),
+                currencies[rng.integers(0, len(currencies), size=n)].tolist(),
+                np.round(notional * rng.uniform(0.85, 1.15, size=n), 2).tolist(),
+                [book] * n,
+                np.datetime_as_string(pos_date + rng.integers(30, 3650, size=n)).tolist(),
+                np.round(rng.uniform(0.01, 0.08, size=n), 6).tolist(),
+            ))
+
+    cols = ['position_date', 'instrument_type', 'instrument_ref', 'counterparty',
+            'notional_amount', 'currency', 'market_value', 'book', 'maturity_date',
+            'yield_rate']
     bulk_insert('treasury.positions', records, cols)
     print(f"  ✓ Treasury Positions: {len(records)} generated")
 
@@ -72,15 +76,15 @@ def generate_fx_rates():
         for ccy, base in base_rates.items():
             drift = rng.normal(0, 0.003)
             base_rates[ccy] = base * (1 + drift)
-            records.append({
-                'rate_date': d.isoformat(),
-                'base_currency': 'GBP',
-                'quote_currency': ccy,
-                'spot_rate': round(base_rates[ccy], 6),
-                'source': 'ECB',
-            })
-
-    cols = list(records[0].keys())
+            records.append((
+                d.isoformat(),
+                'GBP',
+                ccy,
+                round(base_rates[ccy], 6),
+                'ECB',
+            ))
+
+    cols = ['rate_date', 'base_currency', 'quote_currency', 'spot_rate', 'source']
     bulk_insert('treasury.fx_rates', records, cols)
     print(f"  ✓ FX Rates: {len(records)} generated")
 
@@ -96,17 +100,17 @@ def generate_interbank():
         for _ in range(n):
             trade_date = date(2024, month, int(rng.integers(1, 28)))
             term = int(rng.choice([7, 14, 30, 60, 90, 180, 365]))
-            records.append({
-                'trade_date': trade_date.isoformat(),
-                'settlement_date': (trade_date + timedelta(days=2)).isoformat(),
-                'maturity_date': (trade_date + timedelta(days=term)).isoformat(),
-                'direction': rng.choice(['lend', 'borrow'], p=[0.55, 0.45]),
-                'counterparty': rng.choice(counterparties),
-                'principal_amount': round(float(rng.choice([5, 10, 15, 20, 25, 50]) * 1_000_000), 2),
-                'currency': 'GBP',
-                'interest_rate': round(float(rng.uniform(0.04, 0.06)), 6),
-                'status': 'active' if month >= 11 else rng.choice(['active', 'matured'], p=[0.3, 0.7]),
-            })
+            records.append((
+                trade_date.isoformat(),
+                (trade_date + timedelta(days=2)).isoformat(),
+                (trade_date + timedelta(days=term)).isoformat(),
+                rng.choice(['lend', 'borrow'], p=[0.55, 0.45]),
+                rng.choice(counterparties),
+                round(float(rng.choice([5, 10, 15, 20, 25, 50]) * 1_000_000), 2),
+                'GBP',
+                round(float(rng.uniform(0.04, 0.06)), 6),
+                'active' if month >= 11 else rng.choice(['active', 'matured'], p=[0.3, 0.7]),
+            ))
 
     cols = ['trade_date', 'settlement_date', 'maturity_date', 'direction',
             'counterparty', 'principal_amount', 'currency', 'interest_rate', 'status']
@@ -134,18 +138,19 @@ def generate_liquidity_pool():
             market_val = round(nominal * rng.uniform(0.95, 1.05), 2)
             adjusted = round(market_val * (1 - haircut), 2)
 
-            records.append({
-                'report_date': report_date.isoformat(),
-                'asset_class': asset_class,
-                'instrument_type': f'{asset_class} instruments',
-                'nominal_value': nominal,
-                'market_value': market_val,
-                'haircut_pct': haircut * 100,
-                'adjusted_value': adjusted,
-                'currency': 'GBP',
-            })
-
-    cols = list(records[0].keys())
+            records.append((
+                report_date.isoformat(),
+                asset_class,
+                f'{asset_class} instruments',
+                nominal,
+                market_val,
+                haircut * 100,
+                adjusted,
+                'GBP',
+            ))
+
+    cols = ['report_date', 'asset_class', 'instrument_type', 'nominal_value', 'market_value',
+            'haircut_pct', 'adjusted_value', 'currency']
     bulk_insert('treasury.liquidity_pool', records, cols)
     print(f"  ✓ Liquidity Pool: {len(records)} generated")
 
@@ -19,6 +19,9 @@ MERIDIAN_SORT_CODES = [
     '200800',  # Digital
 ]
 
+# Object array so batched draws share one str per sort code
+_SORT_CODE_POOL = np.array(MERIDIAN_SORT_CODES, dtype=object)
+
 
 def generate_sort_code(rng: np.random.Generator) -> str:
     """Generate a Meridian sort code."""
@@ -30,6 +33,16 @@ def generate_account_number(rng: np.random.Generator) -> str:
     return str(rng.integers(10000000, 99999999))
 
 
+def generate_sort_codes(rng: np.random.Generator, n: int) -> np.ndarray:
+    """Generate n Meridian sort codes in one draw."""
+    return _SORT_CODE_POOL[rng.integers(0, len(_SORT_CODE_POOL), size=n)]
+
+
+def generate_account_numbers(rng: np.random.Generator, n: int) -> np.ndarray:
+    """Generate n 8-digit UK account numbers in one draw."""
+    return rng.integers(10000000, 99999999, size=n).astype(str)
+
+
 def generate_ni_number(rng: np.random.Generator) -> str:
     """Generate a UK National Insurance number (format: AB123456C)."""
     prefix_letters = 'ABCEGHJKLMNPRSTWXYZ'
@@ -100,12 +113,27 @@ SALARY_PAYERS = [
 ]
 
 
+# Counterparty pools built once; object arrays so draws share one str per name
+_SALARY_POOL = np.array(SALARY_PAYERS, dtype=object)
+_BUSINESS_POOL = np.array(BUSINESS_COUNTERPARTIES + RETAIL_COUNTERPARTIES[:10], dtype=object)
+_RETAIL_POOL = np.array(RETAIL_COUNTERPARTIES, dtype=object)
+
+
 def get_counterparty(txn_type: str, is_business: bool, rng: np.random.Generator) -> str:
     """Get a realistic counterparty name based on transaction type."""
     if txn_type == 'salary':
-        return rng.choice(SALARY_PAYERS)
+        return rng.choice(_SALARY_POOL)
     elif is_business:
-        pool = BUSINESS_COUNTERPARTIES + RETAIL_COUNTERPARTIES[:10]
-    else:
-        pool = RETAIL_COUNTERPARTIES
-    return rng.choice(pool)
+        return rng.choice(_BUSINESS_POOL)
+    return rng.choice(_RETAIL_POOL)
+
+
+def get_counterparties(is_salary: np.ndarray, is_business: np.ndarray,
+                       rng: np.random.Generator) -> np.ndarray:
+    """Get counterparty names for many transactions, drawing from the same pools."""
+    names = np.empty(len(is_salary), dtype=object)
+    for pool, mask in ((_SALARY_POOL, is_salary),
+                       (_BUSINESS_POOL, ~is_salary & is_business),
+                       (_RETAIL_POOL, ~is_salary & ~is_business)):
+        names[mask] = pool[rng.integers(0, len(pool), size=int(mask.sum()))]
+    return names
@@ -3,9 +3,17 @@ Shared ID registry — maintains referential integrity across generators.
 Each generator registers the IDs it creates, and other generators look up valid IDs.
 Also provides the shared database engine and bulk insert utilities.
 """
+import csv
+import io
+import itertools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 import numpy as np
+from psycopg2.extensions import AsIs, adapt, register_adapter
+from psycopg2.extras import execute_values
 from sqlalchemy import create_engine, text
-from generators.config import DB_URL, BATCH_SIZE
+from generators.config import DB_URL, BATCH_SIZE, COPY_THRESHOLD
 
 # ── Database engine (shared) ─────────────────────────────────
 _engine = None
@@ -25,30 +33,141 @@ def execute_sql_file(filepath):
         conn.execute(text(sql))
         conn.commit()
 
-def bulk_insert(table_name, records, columns=None):
-    """Bulk insert records into a table using COPY-style efficiency."""
-    if not records:
+# NULL marker for COPY; lets empty strings stay distinct from NULL
+_COPY_NULL = r'\N'
+
+# NumPy scalars reach the INSERT path as parameters; adapt them like their
+# Python counterparts (COPY just renders them with str())
+register_adapter(np.integer, lambda v: AsIs(int(v)))
+register_adapter(np.floating, lambda v: adapt(float(v)))
+register_adapter(np.bool_, lambda v: AsIs(bool(v)))
+
+class _CSVStream:
+    """Read-only file object rendering rows as CSV on demand for COPY FROM STDIN."""
+
+    def __init__(self, rows):
+        self._rows = iter(rows)
+        self._buf = io.StringIO()
+        self._writer = csv.writer(self._buf, lineterminator='\n')
+        self._pending = ''
+
+    def read(self, size=-1):
+        while size < 0 or len(self._pending) < size:
+            chunk = list(itertools.islice(self._rows, BATCH_SIZE))
+            if not chunk:
+                break
+            self._writer.writerows(
+                [_COPY_NULL if v is None else v for v in row] for row in chunk
+            )
+            self._pending += self._buf.getvalue()
+            self._buf.seek(0)
+            self._buf.truncate()
+        if size < 0:
+            size = len(self._pending)
+        out, self._pending = self._pending[:size], self._pending[size:]
+        return out
+
+
+def bulk_insert(table_name, records, columns=None, conn=None):
+    """Bulk insert records into a table via COPY FROM STDIN.
+
+    Records are dicts, or tuples already in ``columns`` order, in any
+    iterable; generators are streamed through a single COPY without being
+    materialised. Loads under COPY_THRESHOLD rows go through one multi-row
+    INSERT instead. When ``conn`` (a SQLAlchemy Connection) is given, the
+    load joins its transaction and committing is left to the caller.
+    """
+    records = iter(records)
+    head = list(itertools.islice(records, COPY_THRESHOLD))
+    if not head:
         return
-    engine = get_engine()
-    if columns is None:
-        columns = list(records[0].keys())
+    first = head[0]
+    small = len(head) < COPY_THRESHOLD
+    records = itertools.chain(head, records)
+    if isinstance(first, dict):
+        if columns is None:
+            columns = list(first.keys())
+        rows = ([r[c] for c in columns] for r in records)
+    else:
+        rows = records
 
-    placeholders = ', '.join([f':{col}' for col in columns])
     col_list = ', '.join(columns)
-    sql = text(f"INSERT INTO {table_name} ({col_list}) VALUES ({placeholders})")
+    if small:
+        def load(cur):
+            execute_values(cur, f"INSERT INTO {table_name} ({col_list}) VALUES %s", rows,
+                           page_size=COPY_THRESHOLD)
+    else:
+        def load(cur):
+            sql = f"COPY {table_name} ({col_list}) FROM STDIN WITH (FORMAT csv, NULL '{_COPY_NULL}')"
+            cur.copy_expert(sql, _CSVStream(rows), size=64 * 1024)
+
+    if conn is not None:
+        with conn.connection.cursor() as cur:
+            load(cur)
+        return
 
-    with engine.connect() as conn:
-        for i in range(0, len(records), BATCH_SIZE):
-            batch = records[i:i + BATCH_SIZE]
-            conn.execute(sql, batch)
-        conn.commit()
+    raw_conn = get_engine().raw_connection()
+    try:
+        with raw_conn.cursor() as cur:
+            load(cur)
+        raw_conn.commit()
+    except Exception:
+        raw_conn.rollback()
+        raise
+    finally:
+        raw_conn.close()
+
+def reserve_ids(table_name, column, n):
+    """Draw n values from a serial column's sequence.
+
+    Lets callers COPY rows with their ids already set instead of selecting
+    them back after the insert.
+    """
+    with get_engine().connect() as conn:
+        return conn.execute(text(
+            "SELECT nextval(pg_get_serial_sequence(:table, :column)) FROM generate_series(1, :n)"
+        ), {'table': table_name, 'column': column, 'n': n}).scalars().all()
+
+@contextmanager
+def indexes_dropped(table_name, conn):
+    """Drop a table's secondary indexes and FKs for a bulk load, then rebuild them.
+
+    Constraint-backed indexes (PK/unique) stay. Everything runs on ``conn``,
+    so the drop, load and rebuild share its transaction.
+    """
+    indexes = conn.execute(text("""
+        SELECT CAST(x.indexrelid AS regclass)::text, pg_get_indexdef(x.indexrelid)
+        FROM pg_index x
+        WHERE x.indrelid = CAST(:t AS regclass)
+          AND NOT EXISTS (SELECT 1 FROM pg_constraint c
+                          WHERE c.conrelid = x.indrelid AND c.conindid = x.indexrelid)
+    """), {'t': table_name}).fetchall()
+    fkeys = conn.execute(text("""
+        SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint
+        WHERE conrelid = CAST(:t AS regclass) AND contype = 'f'
+    """), {'t': table_name}).fetchall()
+
+    for name, _ in fkeys:
+        conn.execute(text(f'ALTER TABLE {table_name} DROP CONSTRAINT "{name}"'))
+    for name, _ in indexes:
+        conn.execute(text(f'DROP INDEX {name}'))
+    yield
+    for _, definition in indexes:
+        conn.execute(text(definition))
+    for name, definition in fkeys:
+        conn.execute(text(f'ALTER TABLE {table_name} ADD CONSTRAINT "{name}" {definition}'))
+
+def _copy_chunk(table, conn, keys, data_iter):
+    """pandas ``to_sql`` method that loads each chunk through bulk_insert's COPY."""
+    name = f'{table.schema}.{table.name}' if table.schema else table.name
+    bulk_insert(name, list(data_iter), keys, conn=conn)
 
 def bulk_insert_df(table_name, df, if_exists='append'):
     """Insert a pandas DataFrame into a table."""
     engine = get_engine()
     schema, table = table_name.rsplit('.', 1) if '.' in table_name else (None, table_name)
     df.to_sql(table, engine, schema=schema, if_exists=if_exists, index=False,
-              method='multi', chunksize=BATCH_SIZE)
+              method=_copy_chunk, chunksize=BATCH_SIZE)
 
 # ── ID Registry ──────────────────────────────────────────────
 class IDRegistry:
@@ -58,8 +177,15 @@ class IDRegistry:
         self._store = {}
 
     def register(self, entity_type: str, ids: list):
-        """Register a list of IDs for an entity type."""
-        self._store[entity_type] = np.array(ids)
+        """Register a list of IDs for an entity type.
+
+        Integer IDs are held as one contiguous int64 array so callers can
+        sample, repeat and mask them without per-element conversion.
+        """
+        ids = np.asarray(ids)
+        if ids.dtype.kind in 'iu':
+            ids = ids.astype(np.int64, copy=False)
+        self._store[entity_type] = ids
 
     def get_ids(self, entity_type: str) -> np.ndarray:
         """Get all registered IDs for an entity type."""
@@ -68,6 +194,12 @@ class IDRegistry:
                           f"Available: {list(self._store.keys())}")
         return self._store[entity_type]
 
+    def get_or_compute(self, entity_type: str, compute) -> np.ndarray:
+        """Get registered IDs, registering the result of compute() on first use."""
+        if entity_type not in self._store:
+            self.register(entity_type, compute())
+        return self._store[entity_type]
+
     def get_random_ids(self, entity_type: str, n: int, rng: np.random.Generator = None) -> np.ndarray:
         """Get n random IDs from registered entity, with replacement."""
         ids = self.get_ids(entity_type)
@@ -87,6 +219,36 @@ class IDRegistry:
         """Return summary of registered entities and counts."""
         return {k: len(v) for k, v in self._store.items()}
 
+    def snapshot(self) -> dict:
+        """Return a shallow copy of all registered entities."""
+        return dict(self._store)
+
+    def merge(self, entries: dict):
+        """Adopt entities registered elsewhere (e.g. in a worker process)."""
+        self._store.update(entries)
+
 
 # Global registry instance
 registry = IDRegistry()
+
+
+# ── Parallel execution ───────────────────────────────────────
+def _call_with_registry(func, registered):
+    """Run func in a worker seeded with the parent's registry; return new entries."""
+    registry.merge(registered)
+    func()
+    return {k: v for k, v in registry.snapshot().items() if registered.get(k) is not v}
+
+
+def run_parallel(*funcs):
+    """Run independent generator functions concurrently, one process each.
+
+    Workers are spawned, so each opens its own engine; IDs they register are
+    merged back into this process's registry.
+    """
+    registered = registry.snapshot()
+    with ProcessPoolExecutor(max_workers=len(funcs),
+                             mp_context=multiprocessing.get_context('spawn')) as pool:
+        futures = [pool.submit(_call_with_registry, func, registered) for func in funcs]
+        for future in futures:
+            registry.merge(future.result())
@@ -0,0 +1,151 @@
+"""
+Test bulk_insert's COPY and INSERT paths against a fake cursor (no database needed).
+"""
+import csv
+import io
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from generators.config import COPY_THRESHOLD
+from generators.utils import relationships
+from generators.utils.relationships import bulk_insert, _CSVStream
+
+
+class _FakeCursor:
+    """Records COPY payloads (read in small slices, as psycopg2 does)."""
+
+    def __init__(self):
+        self.copies = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def copy_expert(self, sql, file, size=8192):
+        chunks = []
+        while True:
+            chunk = file.read(size)
+            if not chunk:
+                break
+            chunks.append(chunk)
+        self.copies.append((sql, ''.join(chunks)))
+
+
+class _FakeConnection:
+    """Stands in for a SQLAlchemy Connection; bulk_insert only uses .connection.cursor()."""
+
+    def __init__(self):
+        self.cur = _FakeCursor()
+        self.connection = self
+
+    def cursor(self):
+        return self.cur
+
+
+def _copy(records, columns=None, n_pad=COPY_THRESHOLD):
+    """Run bulk_insert padded onto the COPY path; return (sql, payload, rows parsed back)."""
+    conn = _FakeConnection()
+    pad = [records[-1]] * n_pad
+    bulk_insert('s.t', records + pad, columns, conn=conn)
+    (sql, payload), = conn.cur.copies
+    lines = list(csv.reader(io.StringIO(payload)))
+    return sql, payload, lines[:len(records)]
+
+
+def test_null_vs_empty_string():
+    sql, payload, _ = _copy([(1, None, '', 'x')], ['a', 'b', 'c', 'd'])
+    assert "NULL '\\N'" in sql
+    # NULL is the unquoted marker; an empty string stays an empty field
+    assert payload.startswith('1,\\N,,x\n')
+
+
+def test_quoting_and_newlines_round_trip():
+    values = ('a,b', 'say "hi"', 'line1\nline2', "it's", ' padded ')
+    _, _, rows = _copy([values], ['a', 'b', 'c', 'd', 'e'])
+    assert rows == [list(values)]
+
+
+def test_dict_and_tuple_records_match():
+    tuples = [(1, 'x', None), (2, 'y', 3.5)]
+    dicts = [{'c': c, 'a': a, 'b': b} for a, b, c in tuples]
+    _, tuple_payload, _ = _copy(tuples, ['a', 'b', 'c'])
+    sql, dict_payload, _ = _copy(dicts, ['a', 'b', 'c'])
+    assert dict_payload == tuple_payload
+    assert sql.startswith('COPY s.t (a, b, c) FROM STDIN')
+
+
+def test_dict_columns_default_to_first_record_keys():
+    sql, _, rows = _copy([{'x': 1, 'y': 'z'}])
+    assert '(x, y)' in sql
+    assert rows == [['1', 'z']]
+
+
+def test_generator_streamed_in_order():
+    conn = _FakeConnection()
+    n = COPY_THRESHOLD * 3 + 7
+    bulk_insert('s.t', ((i, f'r{i}') for i in range(n)), ['a', 'b'], conn=conn)
+    (_, payload), = conn.cur.copies
+    rows = list(csv.reader(io.StringIO(payload)))
+    assert rows == [[str(i), f'r{i}'] for i in range(n)]
+
+
+def test_csv_stream_partial_reads():
+    rows = [(i, 'v' * (i % 5), None) for i in range(50)]
+    whole = _CSVStream(rows).read()
+    stream, parts = _CSVStream(rows), []
+    while True:
+        part = stream.read(7)
+        if not part:
+            break
+        assert len(part) <= 7
+        parts.append(part)
+    assert ''.join(parts) == whole
+
+
+def test_copy_threshold_switch():
+    calls = []
+    real = relationships.execute_values
+    relationships.execute_values = lambda cur, sql, rows, page_size: calls.append(
+        (sql, list(rows), page_size))
+    try:
+        # Below the threshold: one multi-row INSERT, no COPY
+        conn = _FakeConnection()
+        small = [(i, None) for i in range(COPY_THRESHOLD - 1)]
+        bulk_insert('s.t', small, ['a', 'b'], conn=conn)
+        assert conn.cur.copies == []
+        (sql, rows, page_size), = calls
+        assert sql == 'INSERT INTO s.t (a, b) VALUES %s'
+        assert rows == small and page_size == COPY_THRESHOLD
+
+        # At the threshold: COPY, no INSERT
+        calls.clear()
+        conn = _FakeConnection()
+        bulk_insert('s.t', [(i, None) for i in range(COPY_THRESHOLD)], ['a', 'b'], conn=conn)
+        assert calls == []
+        assert len(conn.cur.copies) == 1
+    finally:
+        relationships.execute_values = real
+
+
+def test_empty_records_do_nothing():
+    conn = _FakeConnection()
+    bulk_insert('s.t', iter(()), ['a'], conn=conn)
+    assert conn.cur.copies == []
+
+
+if __name__ == '__main__':
+    print("\n🧪 Bulk Insert Tests\n")
+    tests = [f for name, f in list(globals().items()) if name.startswith('test_')]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"  ✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"  ❌ {test.__name__}: {e}")
+    print(f"\n  {len(tests) - failed}/{len(tests)} tests passed")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,65 @@
+"""
+Test the LIMIT pushdown applied to agent SQL queries (no database needed).
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from agent.tools import _with_row_limit
+
+
+def test_existing_limit_kept():
+    assert _with_row_limit("SELECT * FROM t LIMIT 10") == "SELECT * FROM t LIMIT 10"
+    assert _with_row_limit("select * from t limit 5") == "select * from t limit 5"
+    assert _with_row_limit("SELECT * FROM t OFFSET 10 LIMIT 5") == "SELECT * FROM t OFFSET 10 LIMIT 5"
+
+
+def test_limit_in_subquery_still_capped():
+    # Only a top-level LIMIT bounds the rows returned
+    assert (_with_row_limit("SELECT * FROM (SELECT * FROM t LIMIT 5) s")
+            == "SELECT * FROM (SELECT * FROM t LIMIT 5) s\nLIMIT 501")
+    assert (_with_row_limit("SELECT * FROM t WHERE id IN (SELECT id FROM u LIMIT 3)")
+            == "SELECT * FROM t WHERE id IN (SELECT id FROM u LIMIT 3)\nLIMIT 501")
+    assert (_with_row_limit("WITH x AS (SELECT 1 LIMIT 1) SELECT * FROM x")
+            == "WITH x AS (SELECT 1 LIMIT 1) SELECT * FROM x\nLIMIT 501")
+
+
+def test_limit_keyword_in_string_literal_ignored():
+    assert (_with_row_limit("SELECT 'LIMIT 5' AS s FROM t")
+            == "SELECT 'LIMIT 5' AS s FROM t\nLIMIT 501")
+
+
+def test_fetch_and_offset():
+    query = "SELECT * FROM t ORDER BY id FETCH FIRST 5 ROWS ONLY"
+    assert _with_row_limit(query) == query
+    # OFFSET alone does not bound the result; Postgres accepts LIMIT after it
+    assert (_with_row_limit("SELECT * FROM t ORDER BY id OFFSET 10")
+            == "SELECT * FROM t ORDER BY id OFFSET 10\nLIMIT 501")
+
+
+def test_trailing_semicolon_and_comments():
+    assert _with_row_limit("SELECT * FROM t;") == "SELECT * FROM t\nLIMIT 501"
+    assert _with_row_limit("SELECT * FROM t; -- trailing\n") == "SELECT * FROM t\nLIMIT 501"
+    # A trailing line comment must not swallow the appended LIMIT
+    assert _with_row_limit("SELECT * FROM t -- note") == "SELECT * FROM t\nLIMIT 501"
+    assert _with_row_limit("SELECT * FROM t /* block */ ;") == "SELECT * FROM t\nLIMIT 501"
+
+
+def test_limit_all_kept():
+    # Explicitly unbounded; fetchmany still caps what is returned
+    assert _with_row_limit("SELECT * FROM t LIMIT ALL") == "SELECT * FROM t LIMIT ALL"
+
+
+if __name__ == '__main__':
+    print("\n🧪 SQL Row Limit Tests\n")
+    tests = [f for name, f in list(globals().items()) if name.startswith('test_')]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"  ✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"  ❌ {test.__name__}: {e}")
+    print(f"\n  {len(tests) - failed}/{len(tests)} tests passed")
+    sys.exit(1 if failed else 0)